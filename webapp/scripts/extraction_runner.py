@@ -6,16 +6,16 @@ This script bridges the web app with the existing Python extraction system.
 
 import os
 import sys
-import json
 import asyncio
 import psycopg
+from psycopg_pool import AsyncConnectionPool
 from datetime import datetime
 from typing import Dict, List, Any
-import subprocess
 import logging
 
 # Add the parent directory to the path to import the extraction modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'zillow_wf'))
+from flexible_waterfront_extractor import FlexibleWaterfrontExtractor
 
 # Configure logging
 logging.basicConfig(
@@ -28,18 +28,88 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# One array per column so the statement text never changes and can stay prepared
+FLUSH_JOB_STATUS_SQL = """
+    UPDATE extraction_jobs AS e
+    SET status = v.status,
+        progress = COALESCE(v.progress, e.progress),
+        processed_urls = COALESCE(v.processed_urls, e.processed_urls),
+        error_count = COALESCE(v.error_count, e.error_count),
+        updated_at = v.updated_at,
+        started_at = COALESCE(v.started_at, e.started_at),
+        completed_at = COALESCE(v.completed_at, e.completed_at)
+    FROM unnest(
+        %s::int[], %s::text[], %s::int[], %s::int[], %s::int[],
+        %s::timestamptz[], %s::timestamptz[], %s::timestamptz[]
+    ) AS v(id, status, progress, processed_urls, error_count, updated_at, started_at, completed_at)
+    WHERE e.id = v.id
+"""
+
+# Wake the runner as soon as a pending job is inserted
+NOTIFY_TRIGGER_SQL = """
+    CREATE OR REPLACE FUNCTION notify_new_job() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('extraction_jobs_changed', NEW.id::text);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    
+    DROP TRIGGER IF EXISTS t_new_job ON extraction_jobs;
+    CREATE TRIGGER t_new_job AFTER INSERT ON extraction_jobs
+    FOR EACH ROW WHEN (NEW.status = 'pending') EXECUTE FUNCTION notify_new_job();
+"""
+
+# Safety re-check in case a notification is missed (e.g. while reconnecting)
+JOB_POLL_FALLBACK_SECONDS = 300
+
+# 'running' jobs not owned by this runner and silent for this long are
+# left over from a crashed runner; fail them so they don't sit there forever
+STALE_JOB_SECONDS = 3600
+
+REAP_STALE_JOBS_SQL = """
+    UPDATE extraction_jobs
+    SET status = 'failed', updated_at = now(), completed_at = now()
+    WHERE status = 'running'
+      AND COALESCE(updated_at, started_at, created_at) < now() - make_interval(secs => %s)
+      AND NOT (id = ANY(%s::int[]))
+    RETURNING id
+"""
+
 class ExtractionRunner:
     def __init__(self, database_url: str):
         self.database_url = database_url
-        self.conn = None
-        self.cur = None
+        self.pool = None
+        self.extractor = None
+        # Latest unsaved state per job, flushed by _flush_loop
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._flush_task = None
+        self._started_jobs = set()
+        self.listen_conn = None
+        self._listen_task = None
+        self._job_event = asyncio.Event()
+        self.max_concurrent_jobs = int(os.getenv('MAX_CONCURRENT_JOBS', '4'))
+        self.sem = asyncio.Semaphore(self.max_concurrent_jobs)
     
     async def connect(self):
-        """Establish database connection"""
+        """Establish database connection and set up the extractor"""
         try:
-            self.conn = await psycopg.AsyncConnection.connect(self.database_url)
-            self.cur = await self.conn.cursor()
+            self.pool = AsyncConnectionPool(self.database_url, min_size=2, max_size=10, open=False)
+            await self.pool.open(wait=True)
             logger.info("✅ Connected to database successfully")
+            
+            # Install the trigger, then LISTEN on a dedicated autocommit connection
+            async with self.pool.connection() as conn:
+                await conn.execute(NOTIFY_TRIGGER_SQL)
+            self.listen_conn = await psycopg.AsyncConnection.connect(self.database_url, autocommit=True)
+            await self.listen_conn.execute("LISTEN extraction_jobs_changed")
+            
+            # Loads existing ZPIDs and opens the HTTP client once; each job runs on a fork
+            self.extractor = FlexibleWaterfrontExtractor(
+                enable_db_storage=True,
+                timeout_seconds=60,
+                max_concurrent_properties=5,
+                simple_logging=True
+            )
             return True
         except Exception as e:
             logger.error(f"❌ Failed to connect to database: {e}")
@@ -47,22 +117,37 @@ class ExtractionRunner:
     
     async def disconnect(self):
         """Close database connection"""
-        if self.cur:
-            await self.cur.close()
-        if self.conn:
-            await self.conn.close()
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._listen_task:
+            self._listen_task.cancel()
+            self._listen_task = None
+        if self.listen_conn:
+            await self.listen_conn.close()
+            self.listen_conn = None
+        if self.extractor:
+            await self.extractor.aclose()
+            self.extractor = None
+        if self.pool:
+            await self.flush_job_status()
+            await self.pool.close()
+            self.pool = None
         logger.info("🔌 Database connection closed")
     
     async def get_pending_jobs(self) -> List[Dict[str, Any]]:
-        """Get all pending extraction jobs"""
+        """Get the oldest pending extraction jobs, up to twice the concurrency budget"""
         try:
-            await self.cur.execute("""
-                SELECT id, urls, total_urls, status, progress, processed_urls, error_count
-                FROM extraction_jobs 
-                WHERE status IN ('pending', 'running')
-                ORDER BY created_at ASC
-            """)
-            jobs = await self.cur.fetchall()
+            async with self.pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("""
+                        SELECT id, urls, total_urls, status, progress, processed_urls, error_count
+                        FROM extraction_jobs
+                        WHERE status = 'pending'
+                        ORDER BY created_at ASC
+                        LIMIT %s
+                    """, (self.max_concurrent_jobs * 2,))
+                    jobs = await cur.fetchall()
             
             return [
                 {
@@ -80,48 +165,81 @@ class ExtractionRunner:
             logger.error(f"Error fetching pending jobs: {e}")
             return []
     
+    async def reap_stale_jobs(self) -> List[int]:
+        """Mark 'running' jobs abandoned by a crashed runner as failed"""
+        try:
+            async with self.pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(REAP_STALE_JOBS_SQL,
+                                      (STALE_JOB_SECONDS, list(self._started_jobs)))
+                    reaped = [row[0] for row in await cur.fetchall()]
+            for job_id in reaped:
+                logger.warning(f"⚠️ Job {job_id} was stuck in 'running', marked as failed")
+            return reaped
+        except Exception as e:
+            logger.error(f"Error reaping stale jobs: {e}")
+            return []
+    
     async def update_job_status(self, job_id: int, status: str, progress: int = None, 
                                processed_urls: int = None, error_count: int = None):
-        """Update job status and progress"""
+        """Record job status and progress for the next flush"""
+        now = datetime.now().astimezone()
+        state = self._pending.setdefault(job_id, {
+            'progress': None, 'processed_urls': None, 'error_count': None,
+            'started_at': None, 'completed_at': None
+        })
+        state['status'] = status
+        state['updated_at'] = now
+        
+        if progress is not None:
+            state['progress'] = progress
+        if processed_urls is not None:
+            state['processed_urls'] = processed_urls
+        if error_count is not None:
+            state['error_count'] = error_count
+        
+        # started_at is only stamped on the first 'running' transition
+        if status == 'running' and job_id not in self._started_jobs:
+            self._started_jobs.add(job_id)
+            state['started_at'] = now
+        if status in ['completed', 'failed']:
+            self._started_jobs.discard(job_id)
+            state['completed_at'] = now
+        
+        logger.info(f"Updated job {job_id}: status={status}, progress={progress}")
+    
+    async def flush_job_status(self):
+        """Write all pending job updates in a single UPDATE"""
+        if not self._pending:
+            return
+        
+        pending, self._pending = self._pending, {}
+        columns = ['status', 'progress', 'processed_urls', 'error_count',
+                   'updated_at', 'started_at', 'completed_at']
+        params = [list(pending)] + [[state[col] for state in pending.values()] for col in columns]
+        
         try:
-            update_fields = ["status = %s", "updated_at = %s"]
-            update_values = [status, datetime.now()]
-            
-            if progress is not None:
-                update_fields.append("progress = %s")
-                update_values.append(progress)
-            
-            if processed_urls is not None:
-                update_fields.append("processed_urls = %s")
-                update_values.append(processed_urls)
-            
-            if error_count is not None:
-                update_fields.append("error_count = %s")
-                update_values.append(error_count)
-            
-            if status == 'running' and 'started_at = %s' not in update_fields:
-                update_fields.append("started_at = %s")
-                update_values.append(datetime.now())
-            
-            if status in ['completed', 'failed'] and 'completed_at = %s' not in update_fields:
-                update_fields.append("completed_at = %s")
-                update_values.append(datetime.now())
-            
-            query = f"""
-                UPDATE extraction_jobs 
-                SET {', '.join(update_fields)}
-                WHERE id = %s
-            """
-            update_values.append(job_id)
-            
-            await self.cur.execute(query, update_values)
-            await self.conn.commit()
-            
-            logger.info(f"Updated job {job_id}: status={status}, progress={progress}")
-            
+            # The pool commits on a clean exit and rolls back on error
+            async with self.pool.connection() as conn:
+                await conn.execute(FLUSH_JOB_STATUS_SQL, params, prepare=True)
         except Exception as e:
-            logger.error(f"Error updating job {job_id}: {e}")
-            await self.conn.rollback()
+            logger.error(f"Error flushing status for jobs {list(pending)}: {e}")
+            # Requeue for the next flush; updates recorded since the swap are newer
+            for job_id, state in pending.items():
+                newer = self._pending.get(job_id)
+                if newer is None:
+                    self._pending[job_id] = state
+                else:
+                    # Keep older values (e.g. started_at) the newer update didn't set
+                    for col, value in state.items():
+                        if newer.get(col) is None:
+                            newer[col] = value
+    
+    async def _flush_loop(self, interval: float = 1.0):
+        """Flush coalesced job updates at most once per interval"""
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush_job_status()
     
     async def run_extraction_job(self, job: Dict[str, Any]):
         """Run a single extraction job using the existing extraction system"""
@@ -135,114 +253,77 @@ class ExtractionRunner:
             # Update job status to running
             await self.update_job_status(job_id, 'running', 0, 0, 0)
             
-            # Create a temporary URLs file for the extraction script
-            urls_file = f"/tmp/extraction_job_{job_id}_urls.txt"
-            with open(urls_file, 'w') as f:
-                for url in urls:
-                    f.write(f"{url}\n")
-            
-            # Run the extraction script
-            extraction_script = os.path.join(
-                os.path.dirname(__file__), '..', '..', 'zillow_wf', 
-                'flexible_waterfront_extractor.py'
-            )
-            
-            if not os.path.exists(extraction_script):
-                logger.error(f"Extraction script not found: {extraction_script}")
-                await self.update_job_status(job_id, 'failed', 0, 0, total_urls)
-                return
-            
-            # Build the command to run the extraction
-            cmd = [
-                sys.executable,  # Use current Python interpreter
-                extraction_script,
-                '--mode', 'urls',
-                '--continue', urls_file,
-                '--enable-db-storage',
-                '--simple',
-                '--max-concurrent-properties', '5',
-                '--timeout', '60'
-            ]
-            
-            logger.info(f"Running command: {' '.join(cmd)}")
-            
-            # Start the extraction process
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            # Monitor the process and update progress
-            processed_urls = 0
             error_count = 0
             
-            while True:
-                # Check if process is still running
-                if process.returncode is not None:
-                    break
-                
-                # Update progress every 10 seconds
-                await asyncio.sleep(10)
-                
-                # Simulate progress updates (in real implementation, parse output)
-                processed_urls = min(processed_urls + 2, total_urls)
-                progress = int((processed_urls / total_urls) * 100)
-                
-                await self.update_job_status(
-                    job_id, 'running', progress, processed_urls, error_count
-                )
+            async def report_progress(done: int, total: int, failed: int):
+                nonlocal error_count
+                error_count = failed
+                progress = int((done / total) * 100) if total else 0
+                await self.update_job_status(job_id, 'running', progress, done, failed)
             
-            # Get the final result
-            stdout, stderr = await process.communicate()
+            # Own counters and report files per job; HTTP client and DB engine are shared
+            extractor = self.extractor.fork(run_suffix=f"_job{job_id}")
+            await extractor.extract_multiple_properties(
+                urls, progress_callback=report_progress
+            )
             
-            if process.returncode == 0:
-                logger.info(f"✅ Extraction job {job_id} completed successfully")
-                await self.update_job_status(
-                    job_id, 'completed', 100, total_urls, error_count
-                )
-            else:
-                logger.error(f"❌ Extraction job {job_id} failed with return code {process.returncode}")
-                logger.error(f"Stderr: {stderr.decode()}")
-                await self.update_job_status(
-                    job_id, 'failed', progress, processed_urls, total_urls
-                )
+            logger.info(f"✅ Extraction job {job_id} completed successfully")
+            await self.update_job_status(
+                job_id, 'completed', 100, total_urls, error_count
+            )
             
-            # Clean up temporary file
-            if os.path.exists(urls_file):
-                os.remove(urls_file)
-                
         except Exception as e:
             logger.error(f"Error running extraction job {job_id}: {e}")
             await self.update_job_status(job_id, 'failed', 0, 0, total_urls)
     
+    async def _listen_for_jobs(self):
+        """Set the job event whenever a new job is announced"""
+        async for notify in self.listen_conn.notifies():
+            logger.info(f"🔔 New extraction job {notify.payload}")
+            self._job_event.set()
+    
+    async def _wait_for_jobs(self):
+        """Sleep until a new job is announced (or the fallback interval passes)"""
+        try:
+            await asyncio.wait_for(self._job_event.wait(), timeout=JOB_POLL_FALLBACK_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def _run_guarded(self, job: Dict[str, Any]):
+        """Run a job once a concurrency slot is free"""
+        async with self.sem:
+            await self.run_extraction_job(job)
+    
     async def run_all_pending_jobs(self):
         """Run all pending extraction jobs"""
         if not await self.connect():
             return
         
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        self._listen_task = asyncio.create_task(self._listen_for_jobs())
+        
         try:
             while True:
-                # Get pending jobs
-                pending_jobs = await self.get_pending_jobs()
+                # Clear first so jobs inserted while we work wake the next wait
+                self._job_event.clear()
                 
-                if not pending_jobs:
-                    logger.info("No pending jobs, waiting...")
-                    await asyncio.sleep(30)  # Wait 30 seconds before checking again
-                    continue
+                # Make finished jobs visible before looking for new ones
+                await self.flush_job_status()
+                await self.reap_stale_jobs()
+                jobs_to_run = await self.get_pending_jobs()
                 
-                logger.info(f"Found {len(pending_jobs)} pending jobs")
+                if not jobs_to_run:
+                    logger.info("No pending jobs, waiting for notification...")
+                    await self._wait_for_jobs()
+                    continue
                 
-                # Process jobs sequentially (can be made concurrent if needed)
-                for job in pending_jobs:
-                    if job['status'] == 'pending':
-                        await self.run_extraction_job(job)
-                    elif job['status'] == 'running':
-                        # Check if job is stuck (running for too long)
-                        # This is a simple implementation - can be enhanced
-                        logger.info(f"Job {job['id']} is already running")
+                logger.info(f"Found {len(jobs_to_run)} pending jobs")
                 
-                await asyncio.sleep(10)  # Wait before checking for new jobs
+                # Process pending jobs concurrently, bounded by the semaphore
+                await asyncio.gather(
+                    *(self._run_guarded(job) for job in jobs_to_run),
+                    return_exceptions=True
+                )
                 
         except KeyboardInterrupt:
             logger.info("Shutting down extraction runner...")
@@ -7,10 +7,10 @@ cur = conn.cursor()
 
 # Check if the extracted properties exist
 zpids = ['43117208', '43111853', '43192880']
+cur.execute('SELECT zpid FROM listings_summary WHERE zpid = ANY(%s)', (zpids,))
+found = {row[0] for row in cur.fetchall()}
 for zpid in zpids:
-    cur.execute('SELECT COUNT(*) FROM listings_summary WHERE zpid = %s', (zpid,))
-    count = cur.fetchone()[0]
-    print(f'ZPID {zpid}: {"Found" if count > 0 else "Not found"} in database')
+    print(f'ZPID {zpid}: {"Found" if zpid in found else "Not found"} in database')
 
 cur.close()
 conn.close()
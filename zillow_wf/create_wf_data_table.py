@@ -4,17 +4,22 @@ Create WF Data Table Script
 Create a new table called wf_data in the zillow_wf database and populate it with waterfront features data.
 """
 
+import os
 import psycopg
 import csv
-import pandas as pd
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 
 class WFDataTableCreator:
+    _DIGIT_RE = re.compile(r'(\d+)')
+    
     def __init__(self, connection_string: str = 'postgresql://osamabedier@localhost:5432/zillow_wf'):
         self.connection_string = connection_string
         self.conn = None
         self.cur = None
+        # True when this run created wf_data UNLOGGED and must set it LOGGED again
+        self.created_unlogged = False
     
     def connect(self):
         """Establish database connection"""
@@ -35,11 +40,11 @@ class WFDataTableCreator:
             self.conn.close()
         print("🔌 Database connection closed")
     
-    def create_table(self):
-        """Create the wf_data table"""
-        try:
-            create_table_sql = """
-            CREATE TABLE IF NOT EXISTS wf_data (
+    @staticmethod
+    def _create_table_sql(table_name: str, unlogged: bool = False) -> str:
+        """Build the CREATE TABLE statement for the wf_data layout"""
+        return f"""
+            CREATE {'UNLOGGED ' if unlogged else ''}TABLE IF NOT EXISTS {table_name} (
                 id SERIAL PRIMARY KEY,
                 zpid VARCHAR(20) NOT NULL,
                 description_length INTEGER,
@@ -51,14 +56,38 @@ class WFDataTableCreator:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
-            """
-            
-            self.cur.execute(create_table_sql)
+        """
+    
+    def create_table(self):
+        """Create the wf_data table"""
+        try:
+            # A new table is created UNLOGGED for the initial bulk load and set
+            # LOGGED at the end of the run. An existing table stays LOGGED: the
+            # upsert only writes changed rows, so switching it would rewrite
+            # (and WAL-log) the whole table twice per run.
+            self.cur.execute("SELECT to_regclass('wf_data');")
+            created = self.cur.fetchone()[0] is None
+            self.cur.execute(self._create_table_sql('wf_data', unlogged=created))
             
-            # Create index on zpid for efficient joins
-            self.cur.execute("CREATE INDEX IF NOT EXISTS idx_wf_data_zpid ON wf_data(zpid);")
+            # The unique zpid index backs the upsert in insert_data and joins.
+            # Tables loaded before it existed may hold duplicate zpids; keep
+            # the last-inserted row of each so the index can be built.
+            self.cur.execute("SELECT to_regclass('wf_data_zpid_uk');")
+            if self.cur.fetchone()[0] is None:
+                self.cur.execute("""
+                    DELETE FROM wf_data a
+                    USING wf_data b
+                    WHERE a.zpid = b.zpid AND a.id < b.id;
+                """)
+                if self.cur.rowcount:
+                    print(f"🧹 Removed {self.cur.rowcount} duplicate zpid rows")
+            self.cur.execute("""
+                DROP INDEX IF EXISTS idx_wf_data_zpid;
+                CREATE UNIQUE INDEX IF NOT EXISTS wf_data_zpid_uk ON wf_data(zpid);
+            """)
             
             self.conn.commit()
+            self.created_unlogged = created
             print("✅ wf_data table created successfully")
             return True
             
@@ -67,111 +96,105 @@ class WFDataTableCreator:
             self.conn.rollback()
             return False
     
-    def load_csv_data(self, csv_file: str):
-        """Load data from CSV file"""
+    @staticmethod
+    def _to_int(value: str) -> Optional[int]:
+        """Convert a CSV cell like '85' or '85.0' to int, None if empty or invalid"""
+        if not value:
+            return None
         try:
-            print(f"📁 Loading data from: {csv_file}")
-            
-            # Read CSV with pandas for better handling
-            df = pd.read_csv(csv_file)
-            print(f"📊 Loaded {len(df)} rows from CSV")
-            
-            # Show data types and sample
-            print(f"📋 CSV Columns: {list(df.columns)}")
-            print(f"📋 Data Types: {df.dtypes.to_dict()}")
-            print(f"📋 Sample Data:")
-            print(df.head(3))
-            
-            return df
-            
-        except Exception as e:
-            print(f"❌ Error loading CSV: {e}")
+            return int(float(value))
+        except ValueError:
             return None
     
-    def insert_data(self, df: pd.DataFrame):
+    def _coerce_row(self, row: Dict[str, str]) -> Tuple:
+        """Convert a CSV row into a wf_data record"""
+        # description_length may be text like "80 Feet" - keep the first number
+        num_match = self._DIGIT_RE.search(row['description_length'] or '')
+        
+        return (
+            row['zpid'],
+            int(num_match.group(1)) if num_match else None,
+            self._to_int(row['waterfront_linear_ft']),
+            self._to_int(row['dock_linear_ft']),
+            (row['no_fixed_bridges'] or '').strip().upper() == 'TRUE',
+            row['waterfront_type'] or None,
+            self._to_int(row['any_length'])
+        )
+    
+    def load_csv_data(self, csv_file: str) -> Iterator[Tuple]:
+        """Stream wf_data records from CSV file"""
+        print(f"📁 Loading data from: {csv_file}")
+        
+        with open(csv_file, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                yield self._coerce_row(row)
+    
+    def insert_data(self, records: Iterable[Tuple]):
         """Insert data into the wf_data table"""
         try:
             print("💾 Inserting data into wf_data table...")
             
-            # Clear existing data if any
-            self.cur.execute("DELETE FROM wf_data;")
-            print("🗑️  Cleared existing data")
+            # Stage the CSV in a temp table with the same column types
+            self.cur.execute("""
+                CREATE TEMP TABLE wf_data_stage ON COMMIT DROP AS
+                SELECT zpid, description_length, waterfront_linear_ft, dock_linear_ft,
+                       no_fixed_bridges, waterfront_type, any_length
+                FROM wf_data WITH NO DATA;
+                -- CSV row order, so duplicate zpids resolve to the last row
+                ALTER TABLE wf_data_stage ADD COLUMN csv_row BIGSERIAL;
+            """)
             
-            # Prepare insert statement
-            insert_sql = """
-            INSERT INTO wf_data (
-                zpid, description_length, waterfront_linear_ft, dock_linear_ft, 
+            # Stream all records to the server in a single binary COPY
+            copy_sql = """
+            COPY wf_data_stage (
+                zpid, description_length, waterfront_linear_ft, dock_linear_ft,
                 no_fixed_bridges, waterfront_type, any_length
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ) FROM STDIN (FORMAT BINARY)
             """
+            record_count = 0
+            with self.cur.copy(copy_sql) as copy:
+                # Binary COPY needs explicit wire types (varchar shares text's format)
+                copy.set_types(['text', 'int4', 'int4', 'int4', 'bool', 'text', 'int4'])
+                for record in records:
+                    copy.write_row(record)
+                    record_count += 1
             
-            # Convert DataFrame to list of tuples for insertion
-            records = []
-            for _, row in df.iterrows():
-                # Handle boolean conversion for no_fixed_bridges
-                no_fixed_bridges = row['no_fixed_bridges'] if pd.notna(row['no_fixed_bridges']) else False
-                if isinstance(no_fixed_bridges, str):
-                    no_fixed_bridges = no_fixed_bridges.upper() == 'TRUE'
-                
-                # Handle description_length - extract number if it's text like "80 Feet"
-                description_length = None
-                if pd.notna(row['description_length']):
-                    if isinstance(row['description_length'], str):
-                        # Try to extract number from text like "80 Feet"
-                        import re
-                        num_match = re.search(r'(\d+)', str(row['description_length']))
-                        if num_match:
-                            description_length = int(num_match.group(1))
-                    else:
-                        try:
-                            description_length = int(row['description_length'])
-                        except (ValueError, TypeError):
-                            description_length = None
-                
-                # Handle waterfront_linear_ft
-                waterfront_linear_ft = None
-                if pd.notna(row['waterfront_linear_ft']):
-                    try:
-                        waterfront_linear_ft = int(float(row['waterfront_linear_ft']))
-                    except (ValueError, TypeError):
-                        waterfront_linear_ft = None
-                
-                # Handle dock_linear_ft
-                dock_linear_ft = None
-                if pd.notna(row['dock_linear_ft']):
-                    try:
-                        dock_linear_ft = int(float(row['dock_linear_ft']))
-                    except (ValueError, TypeError):
-                        dock_linear_ft = None
-                
-                # Handle any_length
-                any_length = None
-                if pd.notna(row['any_length']):
-                    try:
-                        any_length = int(float(row['any_length']))
-                    except (ValueError, TypeError):
-                        any_length = None
-                
-                record = (
-                    str(row['zpid']),
-                    description_length,
-                    waterfront_linear_ft,
-                    dock_linear_ft,
-                    no_fixed_bridges,
-                    row['waterfront_type'] if pd.notna(row['waterfront_type']) else None,
-                    any_length
+            # Upsert by zpid, only touching rows whose values changed
+            self.cur.execute("""
+                INSERT INTO wf_data (
+                    zpid, description_length, waterfront_linear_ft, dock_linear_ft,
+                    no_fixed_bridges, waterfront_type, any_length
                 )
-                records.append(record)
+                SELECT DISTINCT ON (zpid)
+                    zpid, description_length, waterfront_linear_ft, dock_linear_ft,
+                    no_fixed_bridges, waterfront_type, any_length
+                FROM wf_data_stage
+                ORDER BY zpid, csv_row DESC
+                ON CONFLICT (zpid) DO UPDATE SET
+                    description_length = EXCLUDED.description_length,
+                    waterfront_linear_ft = EXCLUDED.waterfront_linear_ft,
+                    dock_linear_ft = EXCLUDED.dock_linear_ft,
+                    no_fixed_bridges = EXCLUDED.no_fixed_bridges,
+                    waterfront_type = EXCLUDED.waterfront_type,
+                    any_length = EXCLUDED.any_length,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE (wf_data.description_length, wf_data.waterfront_linear_ft, wf_data.dock_linear_ft,
+                       wf_data.no_fixed_bridges, wf_data.waterfront_type, wf_data.any_length)
+                      IS DISTINCT FROM
+                      (EXCLUDED.description_length, EXCLUDED.waterfront_linear_ft, EXCLUDED.dock_linear_ft,
+                       EXCLUDED.no_fixed_bridges, EXCLUDED.waterfront_type, EXCLUDED.any_length)
+            """)
+            changed_count = self.cur.rowcount
             
-            # Insert in batches
-            batch_size = 100
-            for i in range(0, len(records), batch_size):
-                batch = records[i:i + batch_size]
-                self.cur.executemany(insert_sql, batch)
-                print(f"✅ Inserted batch {i//batch_size + 1}/{(len(records) + batch_size - 1)//batch_size}")
+            # Drop rows whose zpid is no longer in the CSV
+            self.cur.execute("""
+                DELETE FROM wf_data w
+                WHERE NOT EXISTS (SELECT 1 FROM wf_data_stage s WHERE s.zpid = w.zpid)
+            """)
+            print(f"🔄 Upserted {changed_count} changed rows, removed {self.cur.rowcount} stale rows")
             
             self.conn.commit()
-            print(f"✅ Successfully inserted {len(records)} records")
+            print(f"✅ Successfully loaded {record_count} records")
             return True
             
         except Exception as e:
@@ -179,6 +202,19 @@ class WFDataTableCreator:
             self.conn.rollback()
             return False
     
+    def set_logged(self):
+        """Make the loaded wf_data table durable (WAL-logged)"""
+        try:
+            self.cur.execute("ALTER TABLE wf_data SET LOGGED;")
+            self.conn.commit()
+            print("✅ wf_data table marked as LOGGED")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error marking table as logged: {e}")
+            self.conn.rollback()
+            return False
+    
     def verify_data(self):
         """Verify the data was inserted correctly"""
         try:
@@ -269,13 +305,8 @@ class WFDataTableCreator:
             if not self.create_table():
                 return
             
-            # Load CSV data
-            df = self.load_csv_data(csv_file)
-            if df is None:
-                return
-            
-            # Insert data
-            if not self.insert_data(df):
+            # Stream CSV rows straight into the table
+            if not self.insert_data(self.load_csv_data(csv_file)):
                 return
             
             # Verify data
@@ -291,6 +322,11 @@ class WFDataTableCreator:
         except Exception as e:
             print(f"❌ Error during table creation: {e}")
         finally:
+            # Never leave a table this run made UNLOGGED behind, even after a failure
+            if self.created_unlogged:
+                self.conn.rollback()
+                if self.set_logged():
+                    self.created_unlogged = False
             self.disconnect()
 
 def main():
@@ -298,7 +334,6 @@ def main():
     csv_file = "waterfront_features_v4_634_properties2.csv"
     
     # Check if CSV file exists
-    import os
     if not os.path.exists(csv_file):
         print(f"❌ CSV file not found: {csv_file}")
         return
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Shared psycopg connection pools for the database scripts.
+Connections are reused across runs within one process (cron loops, web handlers)
+instead of paying the connect/auth handshake on every run.
+Also applies the idempotent SQL files in migrations/.
+"""
+
+import atexit
+from pathlib import Path
+from typing import Dict
+import psycopg
+from psycopg_pool import ConnectionPool
+
+MIGRATIONS_DIR = Path(__file__).parent / 'migrations'
+
+_POOLS: Dict[str, ConnectionPool] = {}
+
+def get_pool(conninfo: str, max_size: int = 4) -> ConnectionPool:
+    """Return the process-wide pool for conninfo with at least max_size connections"""
+    pool = _POOLS.get(conninfo)
+    if pool is None:
+        # The scripts only read (or run idempotent DDL), so skip the implicit
+        # BEGIN/COMMIT per statement; use conn.transaction() where one is needed
+        pool = ConnectionPool(conninfo, min_size=1, max_size=max_size,
+                              kwargs={'autocommit': True}, open=True)
+        atexit.register(pool.close)
+        _POOLS[conninfo] = pool
+    elif pool.max_size < max_size:
+        # An earlier caller opened a smaller pool; grow it so this caller's
+        # workers don't wait on each other (PoolTimeout)
+        pool.resize(pool.min_size, max_size)
+    return pool
+
+def _migration_statements(migration: Path):
+    """Split a migration file into its statements, dropping comment lines"""
+    sql = '\n'.join(line for line in migration.read_text().splitlines()
+                    if not line.lstrip().startswith('--'))
+    return [stmt.strip() for stmt in sql.split(';') if stmt.strip()]
+
+def apply_migrations(conn: psycopg.Connection) -> None:
+    """Run the idempotent SQL files in migrations/ in name order
+    
+    Statements run one at a time on the (autocommit) connection so that
+    CREATE INDEX CONCURRENTLY works. A migration that fails, e.g. for lack of
+    CREATE privileges, is reported and skipped rather than aborting the caller.
+    """
+    for migration in sorted(MIGRATIONS_DIR.glob('*.sql')):
+        try:
+            for stmt in _migration_statements(migration):
+                conn.execute(stmt)
+        except psycopg.Error as e:
+            print(f"⚠️ Skipping migration {migration.name}: {e}")
@@ -4,22 +4,195 @@ Corrected Database Exploration Script for Zillow Waterfront Properties
 Based on the actual database schema discovered.
 """
 
-import psycopg
+from db_pool import apply_migrations, get_pool
+import io
+import sys
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Any
 
+# Fields whose completion rate is reported by analyze_data_quality
+QUALITY_FIELDS = [
+    'price', 'beds', 'baths', 'home_size_sqft', 'latitude',
+    'longitude', 'zestimate', 'rent_zestimate', 'year_built', 'is_waterfront'
+]
+
+# Pre-aggregated roll-ups for the market and geographic reports; refreshed
+# at the start of every exploration so it matches the live table_summary numbers
+ROLLUPS_SQL = """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS mv_listings_rollups AS
+    SELECT state, city, home_type,
+           CASE 
+               WHEN days_on_zillow IS NULL THEN NULL
+               WHEN days_on_zillow <= 30 THEN '0-30 days'
+               WHEN days_on_zillow <= 90 THEN '31-90 days'
+               WHEN days_on_zillow <= 180 THEN '91-180 days'
+               ELSE '180+ days'
+           END as market_time,
+           COUNT(*) as cnt,
+           COUNT(price) as priced_cnt,
+           SUM(price) as price_sum
+    FROM listings_summary
+    GROUP BY 1, 2, 3, 4;
+    
+    CREATE UNIQUE INDEX IF NOT EXISTS mv_listings_rollups_uk
+    ON mv_listings_rollups (state, city, home_type, market_time);
+"""
+
+# Every query the explorer runs, so run_full_exploration can queue them all at once
+QUERIES = {
+    'table_summary': """
+        SELECT COUNT(*) as total_records,
+               COUNT(*) FILTER (WHERE is_waterfront IS TRUE) as waterfront_count,
+               COUNT(*) FILTER (WHERE is_waterfront IS FALSE) as non_waterfront_count,
+               COUNT(*) FILTER (WHERE is_waterfront IS NULL) as unknown_waterfront,
+               MIN(created_at) as oldest_record,
+               MAX(created_at) as newest_record,
+               MAX(updated_at) as last_updated
+        FROM listings_summary
+    """,
+    'detail_count': "SELECT COUNT(*) FROM listings_detail",
+    'waterfront_stats': """
+        SELECT 
+            COUNT(*) as total_waterfront,
+            COUNT(CASE WHEN price IS NOT NULL THEN 1 END) as with_price,
+            COUNT(CASE WHEN beds IS NOT NULL THEN 1 END) as with_beds,
+            COUNT(CASE WHEN baths IS NOT NULL THEN 1 END) as with_baths
+        FROM listings_summary 
+        WHERE is_waterfront = true
+    """,
+    'data_quality': f"""
+        SELECT COUNT(*),
+               {', '.join(f'COUNT({field})' for field in QUALITY_FIELDS)},
+               COUNT(*) FILTER (WHERE price > 10000000 OR price < 10000),
+               COUNT(*) FILTER (WHERE latitude IS NULL OR longitude IS NULL)
+        FROM listings_summary
+    """,
+    'home_types': """
+        SELECT home_type, SUM(priced_cnt)::bigint as count,
+               SUM(price_sum)::numeric / SUM(priced_cnt) as avg_price
+        FROM mv_listings_rollups
+        WHERE home_type IS NOT NULL
+        GROUP BY home_type
+        HAVING SUM(priced_cnt) > 0
+        ORDER BY avg_price DESC
+    """,
+    'market_timing': """
+        SELECT market_time, SUM(priced_cnt)::bigint as property_count,
+               SUM(price_sum)::numeric / SUM(priced_cnt) as avg_price
+        FROM mv_listings_rollups
+        WHERE market_time IS NOT NULL
+        GROUP BY market_time
+        HAVING SUM(priced_cnt) > 0
+        ORDER BY 
+            CASE market_time
+                WHEN '0-30 days' THEN 1
+                WHEN '31-90 days' THEN 2
+                WHEN '91-180 days' THEN 3
+                ELSE 4
+            END
+    """,
+    'state_stats': """
+        SELECT state, SUM(cnt)::bigint as count,
+               SUM(price_sum)::numeric / NULLIF(SUM(priced_cnt), 0) as avg_price
+        FROM mv_listings_rollups
+        WHERE state IS NOT NULL
+        GROUP BY state 
+        ORDER BY count DESC 
+        LIMIT 10
+    """,
+    'city_stats': """
+        SELECT city, state, SUM(cnt)::bigint as count,
+               SUM(price_sum)::numeric / NULLIF(SUM(priced_cnt), 0) as avg_price
+        FROM mv_listings_rollups
+        WHERE city IS NOT NULL AND state IS NOT NULL
+        GROUP BY city, state 
+        ORDER BY count DESC 
+        LIMIT 10
+    """,
+    # Rows come back ready to print; zero counts as 'Not available' like before
+    'sample_properties': """
+        SELECT zpid,
+               concat_ws(', ', address, city, state) as address,
+               COALESCE(to_char(NULLIF(price, 0), 'FM"$"999,999,999,999'), 'Not available') as price,
+               COALESCE(NULLIF(beds, 0)::text || '/' || NULLIF(baths, 0)::text, 'Not available') as beds_baths,
+               COALESCE(to_char(NULLIF(home_size_sqft, 0), 'FM999,999,999') || ' sqft', 'Not available') as size,
+               CASE is_waterfront WHEN true THEN 'Yes' WHEN false THEN 'No' ELSE 'Unknown' END as waterfront,
+               created_at
+        FROM listings_summary 
+        ORDER BY created_at DESC 
+        LIMIT %s
+    """,
+    'overall_stats': """
+        SELECT 
+            COUNT(*) as total_properties,
+            COUNT(CASE WHEN is_waterfront = true THEN 1 END) as waterfront_properties,
+            COALESCE(to_char(NULLIF(AVG(price), 0), 'FM"$"999,999,999,999'), 'Not available') as avg_price_all,
+            COALESCE(to_char(NULLIF(AVG(CASE WHEN is_waterfront = true THEN price END), 0), 'FM"$"999,999,999,999'),
+                     'Not available') as avg_price_waterfront,
+            COUNT(DISTINCT state) as states_covered,
+            COUNT(DISTINCT city) as cities_covered,
+            MAX(created_at) as latest_data,
+            COUNT(CASE WHEN created_at >= CURRENT_DATE - INTERVAL '7 days' THEN 1 END) as recent_additions
+        FROM listings_summary
+    """,
+}
+
+# Parameterized queries that are re-run with new arguments (e.g. in batch jobs);
+# prepared explicitly so pooled connections skip re-planning them
+PREPARED_QUERIES = {'sample_properties'}
+
+# Analysis methods run by run_full_exploration, in report order
+SECTIONS = [
+    'get_table_info',
+    'analyze_waterfront_properties',
+    'analyze_data_quality',
+    'analyze_market_trends',
+    'analyze_geographic_distribution',
+    'show_sample_properties',
+    'generate_summary_report',
+]
+
+class _ThreadStdout:
+    """sys.stdout stand-in that lets each worker thread print into its own buffer"""
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    @contextmanager
+    def capture(self, buffer: io.StringIO):
+        """Redirect the calling thread's prints into buffer"""
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            del self._local.buffer
+    
+    def write(self, text: str) -> int:
+        return getattr(self._local, 'buffer', self._stream).write(text)
+    
+    def flush(self):
+        getattr(self._local, 'buffer', self._stream).flush()
+
 class DatabaseExplorer:
     def __init__(self, connection_string: str = 'postgresql://osamabedier@localhost:5432/zillow_wf'):
         self.connection_string = connection_string
+        self.pool = None
         self.conn = None
-        self.cur = None
+        self.max_workers = 4
+        # Cursors with queries already sent by _prefetch, keyed by (name, params)
+        self._prefetched = {}
     
     def connect(self):
         """Establish database connection"""
         try:
-            self.conn = psycopg.connect(self.connection_string)
-            self.cur = self.conn.cursor()
+            # Pooled so repeated runs in one process reuse the connection
+            # One connection for this explorer plus one per analysis worker
+            self.pool = get_pool(self.connection_string, max_size=self.max_workers + 1)
+            self.conn = self.pool.getconn()
             print("✅ Connected to database successfully")
             return True
         except Exception as e:
@@ -28,39 +201,47 @@ class DatabaseExplorer:
     
     def disconnect(self):
         """Close database connection"""
-        if self.cur:
-            self.cur.close()
+        self._prefetched.clear()
         if self.conn:
-            self.conn.close()
-        print("🔌 Database connection closed")
+            # The pool rolls back any open transaction on return
+            self.pool.putconn(self.conn)
+            self.conn = None
+        print("🔌 Database connection released")
+    
+    def _ensure_rollups(self):
+        """Create the roll-up materialized view on first use, refresh it otherwise"""
+        if self.conn.execute("SELECT to_regclass('mv_listings_rollups')").fetchone()[0] is None:
+            self.conn.execute(ROLLUPS_SQL)
+        else:
+            # Every writer (extractor, cache reprocessing, flag fixer) changes
+            # listings_summary, so catch up here instead of in each of them
+            self.conn.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_listings_rollups")
+    
+    def _prefetch(self, **params):
+        """Send every query without waiting for results (pipelined when active)"""
+        for name, query in QUERIES.items():
+            cur = self.conn.cursor()
+            cur.execute(query, params.get(name), prepare=name in PREPARED_QUERIES or None)
+            self._prefetched[(name, params.get(name))] = cur
+    
+    def _query(self, name: str, params: tuple = None):
+        """Return a cursor holding the results of a named query"""
+        cur = self._prefetched.pop((name, params), None)
+        if cur is None:
+            cur = self.conn.cursor()
+            cur.execute(QUERIES[name], params, prepare=name in PREPARED_QUERIES or None)
+        return cur
     
     def get_table_info(self) -> Dict[str, Any]:
         """Get basic information about tables"""
         print("\n📊 TABLE INFORMATION")
         print("=" * 50)
         
-        # Check listings_summary
-        self.cur.execute("""
-            SELECT COUNT(*) as total_records,
-                   COUNT(CASE WHEN is_waterfront = true THEN 1 END) as waterfront_count,
-                   COUNT(CASE WHEN is_waterfront = false THEN 1 END) as non_waterfront_count,
-                   COUNT(CASE WHEN is_waterfront IS NULL THEN 1 END) as unknown_waterfront
-            FROM listings_summary
-        """)
-        summary_stats = self.cur.fetchone()
+        # Counts and data freshness for listings_summary in one scan
+        summary_stats = self._query('table_summary').fetchone()
         
         # Check listings_detail
-        self.cur.execute("SELECT COUNT(*) FROM listings_detail")
-        detail_count = self.cur.fetchone()[0]
-        
-        # Check data freshness
-        self.cur.execute("""
-            SELECT MIN(created_at) as oldest_record,
-                   MAX(created_at) as newest_record,
-                   MAX(updated_at) as last_updated
-            FROM listings_summary
-        """)
-        time_stats = self.cur.fetchone()
+        detail_count = self._query('detail_count').fetchone()[0]
         
         table_info = {
             'summary_total': summary_stats[0],
@@ -68,9 +249,9 @@ class DatabaseExplorer:
             'non_waterfront_count': summary_stats[2],
             'unknown_waterfront': summary_stats[3],
             'detail_total': detail_count,
-            'oldest_record': time_stats[0],
-            'newest_record': time_stats[1],
-            'last_updated': time_stats[2]
+            'oldest_record': summary_stats[4],
+            'newest_record': summary_stats[5],
+            'last_updated': summary_stats[6]
         }
         
         print(f"📋 listings_summary: {table_info['summary_total']:,} records")
@@ -89,16 +270,7 @@ class DatabaseExplorer:
         print("=" * 50)
         
         # Basic waterfront stats
-        self.cur.execute("""
-            SELECT 
-                COUNT(*) as total_waterfront,
-                COUNT(CASE WHEN price IS NOT NULL THEN 1 END) as with_price,
-                COUNT(CASE WHEN beds IS NOT NULL THEN 1 END) as with_beds,
-                COUNT(CASE WHEN baths IS NOT NULL THEN 1 END) as with_baths
-            FROM listings_summary 
-            WHERE is_waterfront = true
-        """)
-        waterfront_stats = self.cur.fetchone()
+        waterfront_stats = self._query('waterfront_stats').fetchone()
         
         if waterfront_stats[0] > 0:
             print(f"💧 Waterfront Properties Found: {waterfront_stats[0]:,}")
@@ -109,14 +281,7 @@ class DatabaseExplorer:
             print("💧 No waterfront properties found in the database")
         
         # Check if there are any properties marked as waterfront
-        self.cur.execute("""
-            SELECT COUNT(*) as waterfront_count
-            FROM listings_summary 
-            WHERE is_waterfront = true
-        """)
-        waterfront_count = self.cur.fetchone()[0]
-        
-        if waterfront_count == 0:
+        if waterfront_stats[0] == 0:
             print("\n⚠️  NOTE: No properties are currently marked as waterfront")
             print("   This could mean:")
             print("   - The waterfront extraction hasn't run yet")
@@ -128,26 +293,11 @@ class DatabaseExplorer:
         print("\n🔍 DATA QUALITY ANALYSIS")
         print("=" * 50)
         
-        # Field completion rates for key fields
-        fields_to_check = [
-            ('price', 'price IS NOT NULL'),
-            ('beds', 'beds IS NOT NULL'),
-            ('baths', 'baths IS NOT NULL'),
-            ('home_size_sqft', 'home_size_sqft IS NOT NULL'),
-            ('latitude', 'latitude IS NOT NULL'),
-            ('longitude', 'longitude IS NOT NULL'),
-            ('zestimate', 'zestimate IS NOT NULL'),
-            ('rent_zestimate', 'rent_zestimate IS NOT NULL'),
-            ('year_built', 'year_built IS NOT NULL'),
-            ('is_waterfront', 'is_waterfront IS NOT NULL')
-        ]
-        
-        total_records = self.cur.execute("SELECT COUNT(*) FROM listings_summary").fetchone()[0]
+        # One scan for all completion counts (COUNT(col) skips NULLs) and quality checks
+        total_records, *completions, extreme_prices, missing_coords = self._query('data_quality').fetchone()
         
         print("📊 Field Completion Rates:")
-        for field, condition in fields_to_check:
-            self.cur.execute(f"SELECT COUNT(*) FROM listings_summary WHERE {condition}")
-            completed = self.cur.fetchone()[0]
+        for field, completed in zip(QUALITY_FIELDS, completions):
             completion_rate = (completed / total_records) * 100
             print(f"   {field}: {completion_rate:.1f}% ({completed:,}/{total_records:,})")
         
@@ -155,20 +305,10 @@ class DatabaseExplorer:
         print(f"\n⚠️  Data Quality Issues:")
         
         # Properties with extreme prices
-        self.cur.execute("""
-            SELECT COUNT(*) FROM listings_summary 
-            WHERE price > 10000000 OR price < 10000
-        """)
-        extreme_prices = self.cur.fetchone()[0]
         if extreme_prices > 0:
             print(f"   Properties with extreme prices (<$10k or >$10M): {extreme_prices:,}")
         
         # Properties with missing coordinates
-        self.cur.execute("""
-            SELECT COUNT(*) FROM listings_summary 
-            WHERE latitude IS NULL OR longitude IS NULL
-        """)
-        missing_coords = self.cur.fetchone()[0]
         if missing_coords > 0:
             print(f"   Properties missing coordinates: {missing_coords:,}")
     
@@ -178,14 +318,7 @@ class DatabaseExplorer:
         print("=" * 50)
         
         # Price distribution by property type
-        self.cur.execute("""
-            SELECT home_type, COUNT(*) as count, AVG(price) as avg_price
-            FROM listings_summary 
-            WHERE home_type IS NOT NULL AND price IS NOT NULL
-            GROUP BY home_type 
-            ORDER BY avg_price DESC
-        """)
-        home_types = self.cur.fetchall()
+        home_types = self._query('home_types').fetchall()
         
         if home_types:
             print("🏠 Home Type Analysis:")
@@ -193,28 +326,7 @@ class DatabaseExplorer:
                 print(f"   {home_type}: {count:,} properties (avg: ${avg_price:,.0f})")
         
         # Days on market analysis
-        self.cur.execute("""
-            SELECT 
-                CASE 
-                    WHEN days_on_zillow <= 30 THEN '0-30 days'
-                    WHEN days_on_zillow <= 90 THEN '31-90 days'
-                    WHEN days_on_zillow <= 180 THEN '91-180 days'
-                    ELSE '180+ days'
-                END as market_time,
-                COUNT(*) as property_count,
-                AVG(price) as avg_price
-            FROM listings_summary 
-            WHERE days_on_zillow IS NOT NULL AND price IS NOT NULL
-            GROUP BY market_time
-            ORDER BY 
-                CASE market_time
-                    WHEN '0-30 days' THEN 1
-                    WHEN '31-90 days' THEN 2
-                    WHEN '91-180 days' THEN 3
-                    ELSE 4
-                END
-        """)
-        market_timing = self.cur.fetchall()
+        market_timing = self._query('market_timing').fetchall()
         
         if market_timing:
             print(f"\n⏰ Days on Market Analysis:")
@@ -227,15 +339,7 @@ class DatabaseExplorer:
         print("=" * 50)
         
         # Properties by state
-        self.cur.execute("""
-            SELECT state, COUNT(*) as count, AVG(price) as avg_price
-            FROM listings_summary 
-            WHERE state IS NOT NULL
-            GROUP BY state 
-            ORDER BY count DESC 
-            LIMIT 10
-        """)
-        state_stats = self.cur.fetchall()
+        state_stats = self._query('state_stats').fetchall()
         
         if state_stats:
             print("🏛️  Top States by Property Count:")
@@ -243,15 +347,7 @@ class DatabaseExplorer:
                 print(f"   {state}: {count:,} properties (avg: ${avg_price:,.0f})")
         
         # Properties by city
-        self.cur.execute("""
-            SELECT city, state, COUNT(*) as count, AVG(price) as avg_price
-            FROM listings_summary 
-            WHERE city IS NOT NULL AND state IS NOT NULL
-            GROUP BY city, state 
-            ORDER BY count DESC 
-            LIMIT 10
-        """)
-        city_stats = self.cur.fetchall()
+        city_stats = self._query('city_stats').fetchall()
         
         if city_stats:
             print(f"\n🏙️  Top Cities by Property Count:")
@@ -263,42 +359,24 @@ class DatabaseExplorer:
         print(f"\n🔍 SAMPLE PROPERTIES (showing {limit})")
         print("=" * 50)
         
-        self.cur.execute("""
-            SELECT zpid, address, city, state, price, beds, baths, 
-                   home_size_sqft, is_waterfront, created_at
-            FROM listings_summary 
-            ORDER BY created_at DESC 
-            LIMIT %s
-        """, (limit,))
-        
-        properties = self.cur.fetchall()
+        properties = self._query('sample_properties', (limit,)).fetchall()
         
-        for i, prop in enumerate(properties, 1):
-            print(f"\n{i}. ZPID: {prop[0]}")
-            print(f"   Address: {prop[1]}, {prop[2]}, {prop[3]}")
-            print(f"   Price: ${prop[4]:,.0f}" if prop[4] else "   Price: Not available")
-            print(f"   Beds/Baths: {prop[5]}/{prop[6]}" if prop[5] and prop[6] else "   Beds/Baths: Not available")
-            print(f"   Size: {prop[7]:,} sqft" if prop[7] else "   Size: Not available")
-            print(f"   Waterfront: {'Yes' if prop[8] else 'No' if prop[8] is False else 'Unknown'}")
-            print(f"   Added: {prop[9]}")
+        for i, (zpid, address, price, beds_baths, size, waterfront, added) in enumerate(properties, 1):
+            print(f"\n{i}. ZPID: {zpid}")
+            print(f"   Address: {address}")
+            print(f"   Price: {price}")
+            print(f"   Beds/Baths: {beds_baths}")
+            print(f"   Size: {size}")
+            print(f"   Waterfront: {waterfront}")
+            print(f"   Added: {added}")
     
     def generate_summary_report(self):
         """Generate a comprehensive summary report"""
         print("\n📋 COMPREHENSIVE SUMMARY REPORT")
         print("=" * 50)
         
-        # Overall statistics
-        self.cur.execute("""
-            SELECT 
-                COUNT(*) as total_properties,
-                COUNT(CASE WHEN is_waterfront = true THEN 1 END) as waterfront_properties,
-                ROUND(AVG(price), 2) as avg_price_all,
-                ROUND(AVG(CASE WHEN is_waterfront = true THEN price END), 2) as avg_price_waterfront,
-                COUNT(DISTINCT state) as states_covered,
-                COUNT(DISTINCT city) as cities_covered
-            FROM listings_summary
-        """)
-        overall_stats = self.cur.fetchone()
+        # Overall statistics and data freshness in one pass over listings_summary
+        overall_stats = self._query('overall_stats').fetchone()
         
         print(f"📊 Overall Statistics:")
         print(f"   Total Properties: {overall_stats[0]:,}")
@@ -306,25 +384,45 @@ class DatabaseExplorer:
         if overall_stats[0] > 0:
             waterfront_percentage = (overall_stats[1]/overall_stats[0]*100)
             print(f"   Waterfront Percentage: {waterfront_percentage:.1f}%")
-        print(f"   Average Price (All): ${overall_stats[2]:,.0f}" if overall_stats[2] else "   Average Price (All): Not available")
-        print(f"   Average Price (Waterfront): ${overall_stats[3]:,.0f}" if overall_stats[3] else "   Average Price (Waterfront): Not available")
+        print(f"   Average Price (All): {overall_stats[2]}")
+        print(f"   Average Price (Waterfront): {overall_stats[3]}")
         print(f"   States Covered: {overall_stats[4]}")
         print(f"   Cities Covered: {overall_stats[5]}")
         
-        # Data freshness
-        self.cur.execute("""
-            SELECT 
-                MAX(created_at) as latest_data,
-                COUNT(CASE WHEN created_at >= CURRENT_DATE - INTERVAL '7 days' THEN 1 END) as recent_additions
-            FROM listings_summary
-        """)
-        freshness = self.cur.fetchone()
-        
+        # Data freshness (from the same scan)
         print(f"\n🕒 Data Freshness:")
-        print(f"   Latest Data: {freshness[0]}")
-        print(f"   Added in Last 7 Days: {freshness[1]:,}")
+        print(f"   Latest Data: {overall_stats[6]}")
+        print(f"   Added in Last 7 Days: {overall_stats[7]:,}")
+    
+    def _run_section(self, name: str, stdout: _ThreadStdout) -> str:
+        """Run one analysis method on its own pooled connection and return its output"""
+        worker = DatabaseExplorer(self.connection_string)
+        with self.pool.connection() as conn, stdout.capture(io.StringIO()) as out:
+            worker.conn = conn
+            getattr(worker, name)()
+        return out.getvalue()
     
-    def run_full_exploration(self):
+    def _run_sections_parallel(self):
+        """Run all analysis sections concurrently and print them in report order"""
+        real_stdout = sys.stdout
+        stdout = sys.stdout = _ThreadStdout(real_stdout)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(self._run_section, name, stdout) for name in SECTIONS]
+                for future in futures:
+                    print(future.result(), end='')
+        finally:
+            sys.stdout = real_stdout
+    
+    def _run_sections_pipelined(self):
+        """Run all analysis sections on this connection with one pipelined round trip"""
+        # Queue every query up front so all results arrive together
+        with self.conn.pipeline():
+            self._prefetch(sample_properties=(5,))
+            for name in SECTIONS:
+                getattr(self, name)()
+    
+    def run_full_exploration(self, parallel: bool = True):
         """Run the complete database exploration"""
         if not self.connect():
             return
@@ -333,14 +431,15 @@ class DatabaseExplorer:
             print("🚀 Starting Database Exploration...")
             print(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
-            # Run all analysis methods
-            self.get_table_info()
-            self.analyze_waterfront_properties()
-            self.analyze_data_quality()
-            self.analyze_market_trends()
-            self.analyze_geographic_distribution()
-            self.show_sample_properties()
-            self.generate_summary_report()
+            apply_migrations(self.conn)
+            self._ensure_rollups()
+            
+            # Run all analysis methods: concurrently on separate connections so the
+            # server can work on several scans at once, or pipelined on one
+            if parallel:
+                self._run_sections_parallel()
+            else:
+                self._run_sections_pipelined()
             
             print("\n✅ Database exploration completed successfully!")
             
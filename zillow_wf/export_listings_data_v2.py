@@ -5,21 +5,33 @@ Export specific fields from listings_detail table to a pipe-delimited text file.
 Updated to replace '¦' with ';' and handle newlines within fields.
 """
 
-import psycopg
+from db_pool import get_pool
 import csv
-from typing import List, Dict, Any
+from itertools import islice
+from typing import Iterable, Iterator, Tuple
 from datetime import datetime
 
 class ListingsDataExporterV2:
+    _CLEAN_TABLE = str.maketrans({'¦': ';', '|': ';', '\n': '\\n', '\r': '\\r'})
+    # Leading/trailing run of the characters str.strip() removes (\n and \r are
+    # already escaped by then), as a Postgres regex for _clean_field_sql
+    _WS = r'[ \t\v\f\u001c-\u001f\u0085\u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]'
+    _SQL_STRIP_RE = f'^{_WS}+|{_WS}+$'
+    # Column order of the rows yielded by get_listings_data
+    FIELDS = ['zpid', 'description_raw', 'dock_info', 'waterfront_features', 'canal_info', 'reso_facts']
+    
     def __init__(self, connection_string: str = 'postgresql://osamabedier@localhost:5432/zillow_wf'):
         self.connection_string = connection_string
+        self.pool = None
         self.conn = None
         self.cur = None
     
     def connect(self):
         """Establish database connection"""
         try:
-            self.conn = psycopg.connect(self.connection_string)
+            # Pooled so repeated runs in one process reuse the connection
+            self.pool = get_pool(self.connection_string)
+            self.conn = self.pool.getconn()
             self.cur = self.conn.cursor()
             print("✅ Connected to database successfully")
             return True
@@ -32,127 +44,97 @@ class ListingsDataExporterV2:
         if self.cur:
             self.cur.close()
         if self.conn:
-            self.conn.close()
-        print("🔌 Database connection closed")
+            # The pool rolls back any open transaction on return
+            self.pool.putconn(self.conn)
+            self.conn = None
+        print("🔌 Database connection released")
     
-    def get_listings_data(self) -> List[Dict[str, Any]]:
-        """Get all data from the specified fields in listings_detail table"""
-        try:
-            self.cur.execute("""
+    def get_listings_data(self, batch_size: int = 10000) -> Iterator[Tuple]:
+        """Stream data from the specified fields in listings_detail table"""
+        # Server-side cursor keeps memory at one batch regardless of table size;
+        # dock_info comes from listings_summary in the same query. The pooled
+        # connection is autocommit, so open the transaction the cursor lives in.
+        with self.conn.transaction(), self.conn.cursor(name="export_cur") as cur:
+            cur.execute("""
                 SELECT 
-                    zpid,
-                    description_raw,
-                    waterfront_features,
-                    canal_info,
-                    reso_facts
-                FROM listings_detail
-                ORDER BY zpid
+                    d.zpid,
+                    d.description_raw,
+                    s.dock_info,
+                    d.waterfront_features,
+                    d.canal_info,
+                    d.reso_facts
+                FROM listings_detail d
+                LEFT JOIN listings_summary s USING (zpid)
+                ORDER BY d.zpid
             """)
             
-            results = self.cur.fetchall()
-            print(f"📊 Found {len(results)} records in listings_detail table")
-            
-            # Convert to list of dictionaries
-            data = []
-            for row in results:
-                zpid, description_raw, waterfront_features, canal_info, reso_facts = row
-                data.append({
-                    'zpid': zpid,
-                    'description_raw': description_raw or '',
-                    'waterfront_features': waterfront_features or '',
-                    'canal_info': canal_info or '',
-                    'reso_facts': reso_facts or ''
-                })
-            
-            return data
-            
-        except Exception as e:
-            print(f"❌ Error getting listings data: {e}")
-            return []
+            # Rows stay as plain tuples in FIELDS order
+            cur.itersize = batch_size
+            yield from cur
     
-    def get_dock_info_from_summary(self, zpids: List[str]) -> Dict[str, str]:
-        """Get dock_info from listings_summary table for the given ZPIDs"""
-        try:
-            if not zpids:
-                return {}
-            
-            # Create placeholders for the IN clause
-            placeholders = ','.join(['%s'] * len(zpids))
-            
-            self.cur.execute(f"""
-                SELECT zpid, dock_info
-                FROM listings_summary
-                WHERE zpid IN ({placeholders})
-            """, zpids)
-            
-            results = self.cur.fetchall()
-            
-            # Convert to dictionary
-            dock_info_dict = {}
-            for row in results:
-                zpid, dock_info = row
-                dock_info_dict[str(zpid)] = dock_info or ''
-            
-            return dock_info_dict
-            
-        except Exception as e:
-            print(f"❌ Error getting dock_info: {e}")
-            return {}
+    def get_export_stats(self) -> Tuple:
+        """Count exported rows and non-empty values per field in one scan"""
+        self.cur.execute("""
+            SELECT 
+                COUNT(*),
+                COUNT(NULLIF(d.description_raw::text, '')),
+                COUNT(NULLIF(s.dock_info::text, '')),
+                COUNT(NULLIF(d.waterfront_features::text, '')),
+                COUNT(NULLIF(d.canal_info::text, '')),
+                COUNT(NULLIF(d.reso_facts::text, ''))
+            FROM listings_detail d
+            LEFT JOIN listings_summary s USING (zpid)
+        """)
+        return self.cur.fetchone()
     
     def clean_field_value(self, value: str) -> str:
         """Clean field value by replacing problematic characters"""
         if not value:
             return ""
         
-        # Convert to string and clean
-        cleaned = str(value)
-        
-        # Replace problematic characters
-        cleaned = cleaned.replace('¦', ';')  # Replace broken pipe with semicolon
-        cleaned = cleaned.replace('|', ';')  # Replace pipe with semicolon to avoid delimiter confusion
-        cleaned = cleaned.replace('\n', '\\n')  # Replace newlines with literal \n
-        cleaned = cleaned.replace('\r', '\\r')  # Replace carriage returns with literal \r
-        
-        return cleaned.strip()
+        # Broken pipe and pipe become semicolons (avoids delimiter confusion),
+        # newlines and carriage returns become literal \n and \r - in one pass
+        return str(value).translate(self._CLEAN_TABLE).strip()
+    
+    @classmethod
+    def _clean_field_sql(cls, column: str) -> str:
+        """SQL equivalent of clean_field_value for one column (NULL when empty)"""
+        return (f"NULLIF(regexp_replace(replace(replace(translate({column}::text, '¦|', ';;'), "
+                rf"E'\n', '\n'), E'\r', '\r'), '{cls._SQL_STRIP_RE}', '', 'g'), '')")
     
-    def export_to_pipe_delimited(self, data: List[Dict[str, Any]], filename: str = None):
+    def export_to_pipe_delimited(self, filename: str = None):
         """Export data to a pipe-delimited text file"""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"listings_data_export_v2_{timestamp}.txt"
         
+        columns = ',\n'.join(
+            ['d.zpid'] +
+            [f"{self._clean_field_sql(source)} AS {field}" for field, source in (
+                ('description_raw', 'd.description_raw'),
+                ('dock_info', 's.dock_info'),
+                ('waterfront_features', 'd.waterfront_features'),
+                ('canal_info', 'd.canal_info'),
+                ('reso_facts', 'd.reso_facts')
+            )]
+        )
+        # Cleaned fields hold no delimiter or newline, so CSV mode never quotes
+        # them (\x01 as QUOTE just keeps '"' literal); empty values are NULL
+        # and come out as nothing between the pipes
+        copy_sql = f"""
+            COPY (
+                SELECT {columns}
+                FROM listings_detail d
+                LEFT JOIN listings_summary s USING (zpid)
+                ORDER BY d.zpid
+            ) TO STDOUT WITH (FORMAT csv, DELIMITER '|', QUOTE E'\\x01', HEADER)
+        """
+        
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as file:
-                # Write header
-                header = "zpid|description_raw|dock_info|waterfront_features|canal_info|reso_facts"
-                file.write(header + '\n')
-                
-                # Write data rows
-                for row in data:
-                    # Clean and prepare each field
-                    clean_row = []
-                    
-                    # zpid
-                    clean_row.append(str(row.get('zpid', '')))
-                    
-                    # description_raw
-                    clean_row.append(self.clean_field_value(row.get('description_raw', '')))
-                    
-                    # dock_info
-                    clean_row.append(self.clean_field_value(row.get('dock_info', '')))
-                    
-                    # waterfront_features
-                    clean_row.append(self.clean_field_value(row.get('waterfront_features', '')))
-                    
-                    # canal_info
-                    clean_row.append(self.clean_field_value(row.get('canal_info', '')))
-                    
-                    # reso_facts
-                    clean_row.append(self.clean_field_value(row.get('reso_facts', '')))
-                    
-                    # Join with pipe delimiter
-                    line = '|'.join(clean_row)
-                    file.write(line + '\n')
+            # The server formats the rows; chunks go straight to disk
+            with open(filename, 'wb') as file, self.cur.copy(copy_sql) as copy:
+                for chunk in copy:
+                    file.write(chunk)
             
             print(f"✅ Data exported to {filename}")
             return filename
@@ -161,32 +143,26 @@ class ListingsDataExporterV2:
             print(f"❌ Error exporting data: {e}")
             return None
     
-    def export_to_csv(self, data: List[Dict[str, Any]], filename: str = None):
+    def export_to_csv(self, data: Iterable[Tuple], filename: str = None):
         """Export data to a CSV file as backup"""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"listings_data_export_v2_{timestamp}.csv"
         
+        clean = self.clean_field_value
+        
         try:
             with open(filename, 'w', newline='', encoding='utf-8') as file:
-                fieldnames = ['zpid', 'description_raw', 'dock_info', 'waterfront_features', 'canal_info', 'reso_facts']
-                writer = csv.DictWriter(file, fieldnames=fieldnames, delimiter='|')
+                writer = csv.writer(file, delimiter='|')
                 
                 # Write header
-                writer.writeheader()
+                writer.writerow(self.FIELDS)
                 
-                # Write data rows
-                for row in data:
-                    # Clean the data
-                    clean_row = {
-                        'zpid': str(row.get('zpid', '')),
-                        'description_raw': self.clean_field_value(row.get('description_raw', '')),
-                        'dock_info': self.clean_field_value(row.get('dock_info', '')),
-                        'waterfront_features': self.clean_field_value(row.get('waterfront_features', '')),
-                        'canal_info': self.clean_field_value(row.get('canal_info', '')),
-                        'reso_facts': self.clean_field_value(row.get('reso_facts', ''))
-                    }
-                    writer.writerow(clean_row)
+                # Write cleaned data rows
+                writer.writerows(
+                    (str(row[0]), *(clean(value) for value in row[1:]))
+                    for row in data
+                )
             
             print(f"✅ CSV backup exported to {filename}")
             return filename
@@ -203,61 +179,51 @@ class ListingsDataExporterV2:
         try:
             print("🚀 Starting Listings Data Export V2...")
             
-            # Get listings data
-            listings_data = self.get_listings_data()
-            if not listings_data:
-                print("❌ No data found to export")
+            # Export to pipe-delimited text file via COPY
+            text_file = self.export_to_pipe_delimited()
+            if not text_file:
                 return
             
-            # Get dock_info from listings_summary
-            zpids = [str(row['zpid']) for row in listings_data]
-            dock_info_dict = self.get_dock_info_from_summary(zpids)
-            
-            # Add dock_info to the data
-            for row in listings_data:
-                zpid_str = str(row['zpid'])
-                row['dock_info'] = dock_info_dict.get(zpid_str, '')
-            
-            # Export to pipe-delimited text file
-            text_file = self.export_to_pipe_delimited(listings_data)
-            
-            # Export to CSV as backup
-            csv_file = self.export_to_csv(listings_data)
+            # Export to CSV as backup, streaming rows through clean_field_value
+            csv_file = self.export_to_csv(self.get_listings_data())
             
             # Show summary
-            self.show_export_summary(listings_data, text_file, csv_file)
+            self.show_export_summary(text_file, csv_file)
             
         except Exception as e:
             print(f"❌ Error during export: {e}")
         finally:
             self.disconnect()
     
-    def show_export_summary(self, data: List[Dict[str, Any]], text_file: str, csv_file: str):
+    def show_export_summary(self, text_file: str, csv_file: str):
         """Display export summary"""
+        # Counts for every field in one aggregate query instead of a pass per field
+        fields = self.FIELDS[1:]
+        total, *non_empty = self.get_export_stats()
+        samples = list(islice(self.get_listings_data(batch_size=3), 3))
+        
         print(f"\n📊 EXPORT SUMMARY V2")
         print("=" * 60)
-        print(f"Total Records Exported: {len(data)}")
+        print(f"Total Records Exported: {total}")
         print(f"Text File: {text_file}")
         print(f"CSV Backup: {csv_file}")
         
         # Show data quality stats
-        fields = ['description_raw', 'dock_info', 'waterfront_features', 'canal_info', 'reso_facts']
         print(f"\n📈 Data Quality Statistics:")
-        for field in fields:
-            non_empty = sum(1 for row in data if row.get(field))
-            percentage = (non_empty / len(data)) * 100 if data else 0
-            print(f"  {field}: {non_empty}/{len(data)} ({percentage:.1f}%)")
+        for field, count in zip(fields, non_empty):
+            percentage = (count / total) * 100 if total else 0
+            print(f"  {field}: {count}/{total} ({percentage:.1f}%)")
         
         # Show sample data
-        if data:
+        if samples:
             print(f"\n🏠 Sample Data (first 3 records):")
-            for i, row in enumerate(data[:3], 1):
-                print(f"  {i}. ZPID: {row['zpid']}")
-                print(f"     Description: {str(row['description_raw'])[:100]}...")
-                print(f"     Dock Info: {row['dock_info']}")
-                print(f"     Waterfront Features: {row['waterfront_features']}")
-                print(f"     Canal Info: {row['canal_info']}")
-                print(f"     RESO Facts: {row['reso_facts']}")
+            for i, (zpid, description_raw, dock_info, waterfront_features, canal_info, reso_facts) in enumerate(samples, 1):
+                print(f"  {i}. ZPID: {zpid}")
+                print(f"     Description: {str(description_raw or '')[:100]}...")
+                print(f"     Dock Info: {dock_info or ''}")
+                print(f"     Waterfront Features: {waterfront_features or ''}")
+                print(f"     Canal Info: {canal_info or ''}")
+                print(f"     RESO Facts: {reso_facts or ''}")
                 print()
 
 def main():
@@ -4,39 +4,59 @@ Find Waterfront Footage Script V4
 Enhanced version with additional waterfront/dock features and CSV export for database upload.
 """
 
+import os
 import re
+import sys
+import mmap
 import csv
 import json
 from collections import defaultdict
-from typing import List, Dict, Any, Optional
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple, Union
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # -----------------------
 # Utility helpers
 # -----------------------
 def to_int(x: Optional[str]) -> Optional[int]:
     """Convert string to int, return None if fails"""
-    try:
-        return int(x)
-    except Exception:
-        return None
+    # Callers pass regex digit groups (or None); isdecimal() accepts exactly
+    # the digits int() does, without raising on the misses
+    return int(x) if x and x.isdecimal() else None
 
 def uniq_join(values: List[str]) -> str:
     """Join unique values with semicolon separator"""
-    seen, out = set(), []
+    # First spelling of each case-insensitive key wins; dicts keep insertion order
+    seen: Dict[str, str] = {}
     for v in values:
-        if not v:
-            continue
-        key = v.strip().lower()
-        if key not in seen:
-            seen.add(key)
-            out.append(v.strip())
-    return "; ".join(out)
+        if v:
+            v = v.strip()
+            seen.setdefault(v.lower(), v)
+    return "; ".join(seen.values())
 
 # -----------------------
 # Token & keyword helpers
 # -----------------------
-WORD = r"[A-Za-z0-9]+(?:[-'][A-Za-z0-9]+)*"
+# A word's letter runs never need to give characters back (whatever follows
+# a WORD must start at a non-alphanumeric), so on Pythons whose re supports
+# possessive quantifiers they are made possessive to cut off backtracking
+_POSSESSIVE = "+" if sys.version_info >= (3, 11) else ""
+WORD = rf"[A-Za-z0-9]+{_POSSESSIVE}(?:[-'][A-Za-z0-9]+{_POSSESSIVE})*"
 FEET_QUOTE = r"['\u2019]"  # straight or curly apostrophe
 
 # Water body / type signals
@@ -53,27 +73,17 @@ WATER_TYPES = [
     ("waterfront",   r"\bwater\s*front(?:age)?\b|\bwaterfront\b|\bwf\b"),
 ]
 
-# Heuristic keywords that make a snippet "useful"
-KEYWORDS = re.compile(
-    r"""(?ix)\b(
-        water(?:\s*front(?:age)?|frontage|font) |  # waterfront / water front / water-front / waterfont (typo)
-        frontage | canal | beach | bay | ocean | intracoastal | icw | river | channel |
-        seawall | bulkhead | dock(?:age|s)? | t-?dock | u-?dock |
-        slip(?:s)? | boat(?:\s+slip|s)? | lift(?:s)? | moor(?:ing|age)? |
-        depth | deep-?water | seawall(?:\s+frontage)? |
-        wf
-    )\b""",
-    re.IGNORECASE
-)
-
-STOP_PUNCT = re.compile(r"[.;:!?]")
+# All water types in one alternation: a single scan reports every type present
+# (the type words never overlap, so no match can hide another)
+WATER_TYPE_RE = re.compile("|".join(f"(?P<{name}>{pat})" for name, pat in WATER_TYPES), re.IGNORECASE)
 
 # -----------------------
 # Master patterns
 # -----------------------
 
-# 1) Line ID at start
-LINE_ID_RE = re.compile(r"(?m)^\s*(\d{9,10})\b(.*)$")
+# 1) Line ID at start (matched per line; extract_matches splits on "\n" only,
+#    the one line break (?m)^ and . recognise, unlike str.splitlines)
+LINE_ID_RE = re.compile(r"\s*(\d{9,10})\b")
 
 # 2) Core "unit phrase" (2–3 digit number + suffix variations) with context words
 UNIT_PHRASE_RE = re.compile(
@@ -154,157 +164,213 @@ BRIDGE_CLEARANCE_RE = re.compile(rf"(?ix)\b(\d{{2,3}})\s*(?:{FEET_QUOTE}\b|ft\.?
 DIST_TO_INLET_RE = re.compile(r"(?ix)\b(\d{1,2})\s*(?:min|minutes?)\s*(?:to|to\s+the)\s*(?:inlet|ocean)\b")
 CANAL_WIDTH_RE = re.compile(rf"(?ix)\b(\d{{2,3}})\s*(?:{FEET_QUOTE}\b|ft\.?\b|feet\b)\s*(?:canal\s+width|wide\s+canal|canal\s+wide)\b")
 
-# -----------------------
-# Utilities
-# -----------------------
-
-def expand_useful_context(rest: str, start: int, end: int, min_tokens_after: int = 5, max_chars: int = 160) -> str:
-    """
-    Expand [start:end] to include more context when needed.
-    - Ensure at least `min_tokens_after` tokens after the match (unless punctuation)
-    - Stop expansion at sentence punctuation or max_chars.
-    - If the expanded snippet still lacks KEYWORDS, extend a bit more (once).
-    """
-    snippet = rest[start:end]
+# One scan for a standalone 2-3 digit number, shared by the patterns built on one
+NUMBER_RE = re.compile(r"(?<!\d)\d{2,3}(?!\d)")
+
+# Every pattern extract_from_line runs, fused into one alternation. Separate
+# finditer passes are still needed to report overlapping matches, but a line
+# the master pattern can't match anywhere can't match any single pattern either.
+MEASUREMENT_PATTERNS = [
+    ("unit_phrase", UNIT_PHRASE_RE),
+    ("label", LABEL_RE),
+    ("range", RANGE_RE),
+    ("slip_count", SLIP_COUNT_RE),
+    ("max_length", MAX_LENGTH_RE),
+    ("max_beam", MAX_BEAM_RE),
+    ("lift_k", LIFT_K_RE),
+    ("lift_lb", LIFT_LB_RE),
+    ("depth", DEPTH_RE),
+    ("no_fixed_bridges", NO_FIXED_BRIDGES_RE),
+    ("bridge_clearance", BRIDGE_CLEARANCE_RE),
+    ("dist_to_inlet", DIST_TO_INLET_RE),
+    ("canal_width", CANAL_WIDTH_RE),
+]
+MASTER_RE = re.compile(
+    "|".join(f"(?P<{name}>{pat.pattern.replace('(?ix)', '', 1)}\n)" for name, pat in MEASUREMENT_PATTERNS),
+    re.IGNORECASE | re.VERBOSE
+)
 
-    # Try extend forward to punctuation or token count
-    forward = rest[end:]
-    # stop at first strong punctuation
-    m = STOP_PUNCT.search(forward)
-    forward_limit = m.start() if m else len(forward)
+def _build_gate() -> Callable[[str], Any]:
+    """Return a callable telling whether any measurement pattern can match a line"""
+    if hyperscan is None:
+        return MASTER_RE.search
+    
+    # Hyperscan scans all patterns at once; prefilter mode approximates the
+    # lookarounds it can't run, so it may over-report but never misses a line
+    # the exact re passes would match
+    try:
+        exprs = [pat.pattern.replace(r"\u2019", r"\x{2019}").encode() for _, pat in MEASUREMENT_PATTERNS]
+        flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 |
+                 hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH)
+        db = hyperscan.Database()
+        db.compile(expressions=exprs, ids=list(range(len(exprs))), flags=[flags] * len(exprs))
+    except Exception:
+        return MASTER_RE.search
+    scratch = hyperscan.Scratch(db)
+    
+    def gate(rest: str) -> bool:
+        hits = []
+        db.scan(rest.encode("utf-8"), match_event_handler=lambda *args: hits.append(args[0]), scratch=scratch)
+        return bool(hits)
+    return gate
+
+MEASUREMENT_GATE = _build_gate()
+
+# Every measurement pattern needs at least one of these literals, so a line
+# without any of them is skipped before the regex gate even runs
+GATE_LITERALS = [
+    "'", "\u2019", "ft", "feet", "foot", "dock", "slip", "water", "wf", "frontage",
+    "seawall", "bulkhead", "depth", "bridge", "canal", "beam", "lb", "pound", "fixed", "min",
+]
+# re.IGNORECASE also folds these onto ASCII letters; str.lower() doesn't
+_GATE_FOLD = str.maketrans({"\u0131": "i", "\u017f": "s"})
+
+if ahocorasick is not None:
+    _LITERAL_AUTOMATON = ahocorasick.Automaton()
+    for _word in GATE_LITERALS:
+        _LITERAL_AUTOMATON.add_word(_word, _word)
+    _LITERAL_AUTOMATON.make_automaton()
+    
+    def has_gate_literal(text: str) -> bool:
+        """Check a lowercased line for any gate literal"""
+        return next(_LITERAL_AUTOMATON.iter(text), None) is not None
+else:
+    _LITERAL_RE = re.compile("|".join(map(re.escape, GATE_LITERALS)))
+    
+    def has_gate_literal(text: str) -> bool:
+        """Check a lowercased line for any gate literal"""
+        return _LITERAL_RE.search(text) is not None
 
-    # make sure we have enough tokens after
-    after_tokens = re.findall(rf"{WORD}", forward[:forward_limit], flags=re.IGNORECASE)
-    extra_span = forward_limit
-    if len(after_tokens) < min_tokens_after:
-        # allow more until we hit next punctuation
-        extra_span = min(len(forward), forward_limit + 80)
+# Helpers used per match; the unflagged ones run on already-lowercased text
+_NON_WORD = re.compile(r"\W+")
+_WATER_SPACED_FRONT = re.compile(r"\bwater\s+front\b")
 
-    extended = (rest[max(0, start-40):start] + snippet + forward[:extra_span]).strip()
-    extended = extended[:max_chars].strip()
+# Whole-word needles for the feature checks: with every run of non-word
+# characters collapsed to one space, " word " in the text is exactly \bword\b
+# ("t-dock" is already a whole-word "dock")
+WATERFRONT_WORDS = (" waterfront ", " frontage ", " wf ", " seawall ", " bulkhead ")
+DOCK_WORDS = (" dock ", " dockage ", " tdock ", " udock ", " slip ", " slips ")
+_STRONG_SNIPPET = re.compile(r"\b(waterfront|frontage|dock|dockage|slip|seawall|wf|depth|bridge|canal)\b", re.IGNORECASE)
 
-    # If still not useful (no waterfront/dock/etc), try one more light extension
-    if not KEYWORDS.search(extended):
-        more = forward[extra_span:extra_span+120]
-        extended = (extended + " " + more).strip()[:max_chars].strip()
+# -----------------------
+# Utilities
+# -----------------------
 
-    return extended
+def padded_words(text: str) -> str:
+    """Collapse non-word runs to single spaces and pad, for whole-word `in` checks"""
+    return f" {_NON_WORD.sub(' ', text)} "
+
+def mentions_waterfront(text: str, padded: str) -> bool:
+    """Whole-word waterfront/frontage/seawall check on lowercased text"""
+    if any(w in padded for w in WATERFRONT_WORDS):
+        return True
+    # "water front" only counts when the gap is whitespace, not "water-front"
+    return " water front " in padded and _WATER_SPACED_FRONT.search(text) is not None
+
+def mentions_dock(padded: str) -> bool:
+    """Whole-word dock/slip check on padded lowercased text"""
+    return any(w in padded for w in DOCK_WORDS)
+
+# Output columns, in row order
+ROW_FIELDS = [
+    "line_id", "snippet", "waterfront_linear_ft", "dock_linear_ft", "slip_count",
+    "max_vessel_length_ft", "max_vessel_beam_ft", "lift_capacity_lbs", "depth_at_mlw_ft",
+    "no_fixed_bridges", "bridge_clearance_ft", "distance_to_inlet_minutes", "canal_width_ft",
+    "waterfront_type", "dock_length", "waterfront_length", "seawall_length", "slip_length",
+    "depth", "other_length",
+]
 
-def categorize_measurement(snippet: str, expanded: str, match_type: str, label: str = None) -> Dict[str, Any]:
-    """
-    Categorize the measurement into specific fields when possible.
-    Returns a dict with categorized measurements and confidence levels.
-    """
-    s = (snippet + " " + expanded).lower()
-    label_lower = label.lower() if label else ""
+class WaterfrontRow:
+    """Features extracted from one export line (slots keep each row one small object)"""
+    __slots__ = (
+        "line_id", "snippet", "waterfront_linear_ft", "dock_linear_ft", "slip_count",
+        "max_vessel_length_ft", "max_vessel_beam_ft", "lift_capacity_lbs", "depth_at_mlw_ft",
+        "no_fixed_bridges", "bridge_clearance_ft", "distance_to_inlet_minutes", "canal_width_ft",
+        "waterfront_type",
+    )
     
-    # Initialize measurement fields
-    measurements = {
-        'dock_length': None,
-        'waterfront_length': None,
-        'seawall_length': None,
-        'slip_length': None,
-        'depth': None,
-        'other_length': None
-    }
+    # Will be populated from our detailed analysis
+    seawall_length = slip_length = other_length = None
     
-    # Extract the number from the snippet
-    number_match = re.search(r'(\d{2,3})', snippet)
-    if not number_match:
-        return measurements
+    def __init__(self, line_id: str):
+        self.line_id = line_id
+        self.snippet = ""
+        self.waterfront_linear_ft = None
+        self.dock_linear_ft = None
+        self.slip_count = None
+        self.max_vessel_length_ft = None
+        self.max_vessel_beam_ft = None
+        self.lift_capacity_lbs = None
+        self.depth_at_mlw_ft = None
+        self.no_fixed_bridges = False
+        self.bridge_clearance_ft = None
+        self.distance_to_inlet_minutes = None
+        self.canal_width_ft = None
+        self.waterfront_type = ""
     
-    number = int(number_match.group(1))
+    # Additional fields from our categorization
+    @property
+    def dock_length(self) -> Optional[int]:
+        return self.dock_linear_ft
     
-    # High confidence categorizations based on explicit labels
-    if match_type == "label":
-        if "dock length" in label_lower:
-            measurements['dock_length'] = number
-            return measurements
-        elif "water frontage" in label_lower:
-            measurements['waterfront_length'] = number
-            return measurements
-        elif "seawall" in label_lower:
-            measurements['seawall_length'] = number
-            return measurements
-        elif "depth" in label_lower:
-            measurements['depth'] = number
-            return measurements
-        elif "frontage" in label_lower:
-            measurements['waterfront_length'] = number
-            return measurements
+    @property
+    def waterfront_length(self) -> Optional[int]:
+        return self.waterfront_linear_ft
     
-    # Medium confidence categorizations based on context
-    if match_type == "dimension":
-        try:
-            # For dimensions like "25'x135'" or "25'×135'", extract the numbers
-            # Handle both regular 'x' and multiplication '×' symbols
-            if 'x' in snippet or '×' in snippet:
-                # Split on either x or × and clean up the numbers
-                parts = re.split(r'[x×]', snippet)
-                if len(parts) == 2:
-                    # Extract numbers, removing any non-digit characters
-                    width_str = re.sub(r'[^\d]', '', parts[0].strip())
-                    height_str = re.sub(r'[^\d]', '', parts[1].strip())
-                    
-                    if width_str and height_str:
-                        width, height = int(width_str), int(height_str)
-                        if width > height:
-                            measurements['waterfront_length'] = width
-                            measurements['other_length'] = height
-                        else:
-                            measurements['waterfront_length'] = height
-                            measurements['other_length'] = width
-        except (ValueError, IndexError):
-            # If dimension parsing fails, fall back to context-based categorization
-            pass
+    @property
+    def depth(self) -> Optional[int]:
+        return self.depth_at_mlw_ft
     
-    # Context-based categorization
-    if re.search(r'\bdock(?:age|s?)\b|\bt-?dock\b|\bu-?dock\b', s):
-        measurements['dock_length'] = number
-    elif re.search(r'\bseawall\b|\bbulkhead\b', s):
-        measurements['seawall_length'] = number
-    elif re.search(r'\bslips?\b|\bboat\s+slips?\b', s):
-        measurements['slip_length'] = number
-    elif re.search(r'\bwater(?:\s*front(?:age)?|frontage|font)\b|\bwf\b|\bfrontage\b', s):
-        measurements['waterfront_length'] = number
-    elif re.search(r'\bdepth\b', s):
-        measurements['depth'] = number
-    elif re.search(r'\bft\.?\b|\bfeet\b|\bfoot\b|'+FEET_QUOTE, s):
-        # If we can't determine specific type, put in other_length
-        measurements['other_length'] = number
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Return the row's values in ROW_FIELDS order"""
+        return tuple(getattr(self, field) for field in ROW_FIELDS)
     
-    return measurements
-
-def extract_from_line(line_id: str, rest: str) -> Dict[str, Any]:
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the row as a dict keyed by ROW_FIELDS"""
+        return dict(zip(ROW_FIELDS, self.as_tuple()))
+
+def _bump(row: WaterfrontRow, field: str, value: Optional[int]) -> None:
+    """Keep the running max of a numeric feature"""
+    if value is not None:
+        current = getattr(row, field)
+        if current is None or value > current:
+            setattr(row, field, value)
+
+def extract_from_line(line_id: str, rest: str) -> WaterfrontRow:
     """Extract all waterfront features from a single line"""
-    feats: Dict[str, Any] = defaultdict(list)
+    row = WaterfrontRow(line_id)
     snippets: List[str] = []
     
-    # Waterfront types (normalize to a small set)
-    wtypes = []
-    for name, pat in WATER_TYPES:
-        if re.search(pat, rest, flags=re.IGNORECASE):
-            wtypes.append(name)
-    if wtypes:
-        feats["waterfront_type"].append(uniq_join(wtypes))
-
-    # Unit phrases
-    for m in UNIT_PHRASE_RE.finditer(rest):
-        start, end = m.span()
-        snippet = rest[start:end].strip()
-        expanded = expand_useful_context(rest, start, end)
-        snippets.append(snippet)
+    # Waterfront types (normalize to a small set), in WATER_TYPES order
+    found = {m.lastgroup for m in WATER_TYPE_RE.finditer(rest)}
+    row.waterfront_type = uniq_join([name for name, _ in WATER_TYPES if name in found])
+    
+    # Nothing below can match - skip the per-pattern passes
+    if not has_gate_literal(rest.lower().translate(_GATE_FOLD)) or not MEASUREMENT_GATE(rest):
+        return _finish_row(row, snippets)
+
+    # A standalone 2-3 digit number is required by the unit-phrase, range,
+    # vessel-length, k-lb lift, bridge-clearance and canal-width patterns
+    has_number = NUMBER_RE.search(rest) is not None
+
+    # Unit phrases (the row keeps only the bare snippet)
+    if has_number:
+        for m in UNIT_PHRASE_RE.finditer(rest):
+            start, end = m.span()
+            snippet = rest[start:end].strip()
+            snippets.append(snippet)
         
-        val = to_int(m.group(3))
-        s = snippet.lower()
-        if val is None:
-            continue
-        if re.search(r"\b(waterfront|water\s*front|frontage|wf|seawall|bulkhead)\b", s):
-            feats["waterfront_linear_ft"].append(val)
-        if re.search(r"\b(dock|dockage|t-?dock|u-?dock|slip|slips)\b", s):
-            feats["dock_linear_ft"].append(val)
-        if re.search(r"\bdepth\b", s):
-            feats["depth_at_mlw_ft"].append(val)
+            val = to_int(m.group(3))
+            s = snippet.lower()
+            if val is None:
+                continue
+            padded = padded_words(s)
+            if mentions_waterfront(s, padded):
+                _bump(row, "waterfront_linear_ft", val)
+            if mentions_dock(padded):
+                _bump(row, "dock_linear_ft", val)
+            if " depth " in padded:
+                _bump(row, "depth_at_mlw_ft", val)
 
     # Labeled forms
     for m in LABEL_RE.finditer(rest):
@@ -315,135 +381,177 @@ def extract_from_line(line_id: str, rest: str) -> Dict[str, Any]:
         if number is None:
             continue
         if "water frontage" in label or label == "frontage":
-            feats["waterfront_linear_ft"].append(number)
+            _bump(row, "waterfront_linear_ft", number)
         elif "dock length" in label:
-            feats["dock_linear_ft"].append(number)
+            _bump(row, "dock_linear_ft", number)
         elif "seawall" in label:
-            feats["waterfront_linear_ft"].append(number)
+            _bump(row, "waterfront_linear_ft", number)
         elif "depth" in label:
-            feats["depth_at_mlw_ft"].append(number)
+            _bump(row, "depth_at_mlw_ft", number)
         elif "bridge clearance" in label:
-            feats["bridge_clearance_ft"].append(number)
+            _bump(row, "bridge_clearance_ft", number)
         elif "canal width" in label:
-            feats["canal_width_ft"].append(number)
+            _bump(row, "canal_width_ft", number)
 
     # Ranges -> estimate (mean) and assign based on nearby words
-    for m in RANGE_RE.finditer(rest):
-        a, b = to_int(m.group(1)), to_int(m.group(2))
-        if a and b:
-            est = int(round((a + b) / 2))
-            around = rest[max(0, m.start()-40):m.end()+40].lower()
-            if re.search(r"\b(waterfront|water\s*front|frontage|wf|seawall|bulkhead)\b", around):
-                feats["waterfront_linear_ft"].append(est)
-            if re.search(r"\b(dock|dockage|t-?dock|u-?dock|slip|slips)\b", around):
-                feats["dock_linear_ft"].append(est)
-            snippets.append(rest[m.start():m.end()])
+    if has_number:
+        for m in RANGE_RE.finditer(rest):
+            a, b = to_int(m.group(1)), to_int(m.group(2))
+            if a and b:
+                est = int(round((a + b) / 2))
+                around = rest[max(0, m.start()-40):m.end()+40].lower()
+                padded = padded_words(around)
+                if mentions_waterfront(around, padded):
+                    _bump(row, "waterfront_linear_ft", est)
+                if mentions_dock(padded):
+                    _bump(row, "dock_linear_ft", est)
+                snippets.append(rest[m.start():m.end()])
 
     # Slip count, vessel size, beam
     for m in SLIP_COUNT_RE.finditer(rest):
-        feats["slip_count"].append(to_int(m.group(1)))
-        snippets.append(rest[m.start():m.end()])
-    for m in MAX_LENGTH_RE.finditer(rest):
-        feats["max_vessel_length_ft"].append(to_int(m.group(1)))
+        _bump(row, "slip_count", to_int(m.group(1)))
         snippets.append(rest[m.start():m.end()])
+    if has_number:
+        for m in MAX_LENGTH_RE.finditer(rest):
+            _bump(row, "max_vessel_length_ft", to_int(m.group(1)))
+            snippets.append(rest[m.start():m.end()])
     for m in MAX_BEAM_RE.finditer(rest):
-        feats["max_vessel_beam_ft"].append(to_int(m.group(1)))
+        _bump(row, "max_vessel_beam_ft", to_int(m.group(1)))
         snippets.append(rest[m.start():m.end()])
 
     # Lift capacity
-    for m in LIFT_K_RE.finditer(rest):
-        k = to_int(m.group(1))
-        if k:
-            feats["lift_capacity_lbs"].append(k * 1000)
-            snippets.append(rest[m.start():m.end()])
+    if has_number:
+        for m in LIFT_K_RE.finditer(rest):
+            k = to_int(m.group(1))
+            if k:
+                _bump(row, "lift_capacity_lbs", k * 1000)
+                snippets.append(rest[m.start():m.end()])
     for m in LIFT_LB_RE.finditer(rest):
         lbs = to_int(m.group(1))
         if lbs:
-            feats["lift_capacity_lbs"].append(lbs)
+            _bump(row, "lift_capacity_lbs", lbs)
             snippets.append(rest[m.start():m.end()])
 
     # Depth at MLW / low tide
     for m in DEPTH_RE.finditer(rest):
-        feats["depth_at_mlw_ft"].append(to_int(m.group(1)))
+        _bump(row, "depth_at_mlw_ft", to_int(m.group(1)))
         snippets.append(rest[m.start():m.end()])
 
     # Bridges / inlet distance / canal width
     if NO_FIXED_BRIDGES_RE.search(rest):
-        feats["no_fixed_bridges"].append(True)
+        row.no_fixed_bridges = True
         snippets.append("no fixed bridges")
-    for m in BRIDGE_CLEARANCE_RE.finditer(rest):
-        feats["bridge_clearance_ft"].append(to_int(m.group(1)))
-        snippets.append(rest[m.start():m.end()])
+    if has_number:
+        for m in BRIDGE_CLEARANCE_RE.finditer(rest):
+            _bump(row, "bridge_clearance_ft", to_int(m.group(1)))
+            snippets.append(rest[m.start():m.end()])
     for m in DIST_TO_INLET_RE.finditer(rest):
-        feats["distance_to_inlet_minutes"].append(to_int(m.group(1)))
-        snippets.append(rest[m.start():m.end()])
-    for m in CANAL_WIDTH_RE.finditer(rest):
-        feats["canal_width_ft"].append(to_int(m.group(1)))
+        _bump(row, "distance_to_inlet_minutes", to_int(m.group(1)))
         snippets.append(rest[m.start():m.end()])
+    if has_number:
+        for m in CANAL_WIDTH_RE.finditer(rest):
+            _bump(row, "canal_width_ft", to_int(m.group(1)))
+            snippets.append(rest[m.start():m.end()])
 
+    return _finish_row(row, snippets)
+
+def _finish_row(row: WaterfrontRow, snippets: List[str]) -> WaterfrontRow:
+    """Pick the representative snippet for a finished row"""
     # Choose a representative snippet (prioritize strong waterfront/dock indicators)
-    snippet = ""
     if snippets:
-        strong = [s for s in snippets if re.search(r"\b(waterfront|frontage|dock|dockage|slip|seawall|wf|depth|bridge|canal)\b", s, flags=re.IGNORECASE)]
-        snippet = (strong[0] if strong else snippets[0])[:240]
-
-    # Flatten to a single row with all our enhanced fields
-    row = {
-        "line_id": line_id,
-        "snippet": snippet,
-        "waterfront_linear_ft": max([v for v in feats.get("waterfront_linear_ft", []) if v is not None], default=None),
-        "dock_linear_ft": max([v for v in feats.get("dock_linear_ft", []) if v is not None], default=None),
-        "slip_count": max([v for v in feats.get("slip_count", []) if v is not None], default=None),
-        "max_vessel_length_ft": max([v for v in feats.get("max_vessel_length_ft", []) if v is not None], default=None),
-        "max_vessel_beam_ft": max([v for v in feats.get("max_vessel_beam_ft", []) if v is not None], default=None),
-        "lift_capacity_lbs": max([v for v in feats.get("lift_capacity_lbs", []) if v is not None], default=None),
-        "depth_at_mlw_ft": max([v for v in feats.get("depth_at_mlw_ft", []) if v is not None], default=None),
-        "no_fixed_bridges": True if True in feats.get("no_fixed_bridges", []) else False,
-        "bridge_clearance_ft": max([v for v in feats.get("bridge_clearance_ft", []) if v is not None], default=None),
-        "distance_to_inlet_minutes": max([v for v in feats.get("distance_to_inlet_minutes", []) if v is not None], default=None),
-        "canal_width_ft": max([v for v in feats.get("canal_width_ft", []) if v is not None], default=None),
-        "waterfront_type": uniq_join(feats.get("waterfront_type", [])),
-        # Additional fields from our categorization
-        "dock_length": max([v for v in feats.get("dock_linear_ft", []) if v is not None], default=None),
-        "waterfront_length": max([v for v in feats.get("waterfront_linear_ft", []) if v is not None], default=None),
-        "seawall_length": None,  # Will be populated from our detailed analysis
-        "slip_length": None,     # Will be populated from our detailed analysis
-        "depth": max([v for v in feats.get("depth_at_mlw_ft", []) if v is not None], default=None),
-        "other_length": None,    # Will be populated from our detailed analysis
-    }
-    
+        strong = [s for s in snippets if _STRONG_SNIPPET.search(s)]
+        row.snippet = (strong[0] if strong else snippets[0])[:240]
     return row
 
-def extract_matches(text: str) -> List[Dict[str, Any]]:
+def extract_matches(text: str) -> List[WaterfrontRow]:
     """
     Parse the whole document; return a list of matches across all lines.
-    Each dict includes line_id and all extracted waterfront features.
+    Each row includes line_id and all extracted waterfront features.
     """
-    all_matches: List[Dict[str, Any]] = []
-    for m in LINE_ID_RE.finditer(text):
-        line_id, rest = m.group(1), m.group(2)
-        all_matches.append(extract_from_line(line_id, rest))
+    all_matches: List[WaterfrontRow] = []
+    match_line_id = LINE_ID_RE.match
+    for line in text.split("\n"):
+        m = match_line_id(line)
+        if m:
+            all_matches.append(extract_from_line(m.group(1), line[m.end():]))
     return all_matches
 
+# Below this size, spawning worker processes costs more than it saves
+PARALLEL_MIN_BYTES = 200_000
+MIN_CHUNK_BYTES = 50_000
+# Each process decodes at most this much of the mapped file at a time
+SERIAL_CHUNK_BYTES = 8 * 1024 * 1024
+
+def split_on_lines(buf: bytes, parts: int, start: int = 0, end: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Split buf[start:end] into about `parts` (start, end) spans, each ending on a line boundary"""
+    end = len(buf) if end is None else end
+    chunk_size = max(MIN_CHUNK_BYTES, (end - start) // max(parts, 1))
+    spans = []
+    while start < end:
+        stop = buf.find(b"\n", start + chunk_size, end)
+        stop = end if stop == -1 else stop + 1
+        spans.append((start, stop))
+        start = stop
+    return spans
+
+def decode_chunk(buf: bytes, start: int, end: int) -> str:
+    """Decode a line-aligned byte span the way a text-mode open() would"""
+    return buf[start:end].decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+def prefetch_span(buf: bytes, start: int, end: int) -> None:
+    """Ask the kernel to start reading a span of a mapped file in the background"""
+    if isinstance(buf, mmap.mmap) and hasattr(mmap, "MADV_WILLNEED"):
+        aligned = start - start % mmap.PAGESIZE
+        buf.madvise(mmap.MADV_WILLNEED, aligned, end - aligned)
+
+def extract_spans(buf: bytes, spans: List[Tuple[int, int]]) -> Iterator[WaterfrontRow]:
+    """Extract spans in order, prefetching the next span from disk while parsing the current one"""
+    for i, (start, end) in enumerate(spans):
+        if i + 1 < len(spans):
+            prefetch_span(buf, *spans[i + 1])
+        yield from extract_matches(decode_chunk(buf, start, end))
+
+def extract_file_span(path: str, start: int, end: int) -> List[WaterfrontRow]:
+    """Map the export file in a worker and extract one byte span of it"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        spans = split_on_lines(mm, (end - start) // SERIAL_CHUNK_BYTES + 1, start, end)
+        return list(extract_spans(mm, spans))
+
+def extract_matches_mapped(path: str, buf: bytes, max_workers: Optional[int] = None) -> List[WaterfrontRow]:
+    """Extract a mapped export file chunk by chunk, in worker processes when it is large"""
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(buf) < PARALLEL_MIN_BYTES:
+        return list(extract_spans(buf, split_on_lines(buf, len(buf) // SERIAL_CHUNK_BYTES + 1)))
+    
+    # Workers map the file themselves, so only offsets cross the process boundary
+    spans = split_on_lines(buf, workers)
+    starts, ends = zip(*spans)
+    with ProcessPoolExecutor(max_workers=min(workers, len(spans))) as ex:
+        return list(chain.from_iterable(ex.map(extract_file_span, repeat(path), starts, ends)))
+
 class WaterfrontFootageFinderV4:
     def __init__(self, export_file: str):
         self.export_file = export_file
-        self.results = []
-        self.summary = {}
+        self.results: List[WaterfrontRow] = []
+        self.summary: Dict[str, Any] = {}
     
-    def load_export_file(self) -> str:
-        """Load the exported listings data file"""
+    def load_export_file(self) -> Optional[Union[mmap.mmap, bytes]]:
+        """Memory-map the exported listings data file (empty bytes for an empty file)"""
         try:
-            with open(self.export_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(self.export_file, 'rb') as f:
+                # mmap can't map a zero-length file
+                if os.fstat(f.fileno()).st_size == 0:
+                    content = b""
+                else:
+                    content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
             print(f"✅ Loaded export file: {self.export_file}")
-            print(f"📊 File size: {len(content):,} characters")
+            print(f"📊 File size: {len(content):,} bytes")
             return content
         except Exception as e:
             print(f"❌ Error loading file: {e}")
-            return ""
+            return None
     
-    def find_footage(self) -> List[Dict[str, Any]]:
+    def find_footage(self) -> List[WaterfrontRow]:
         """Find waterfront footage using the enhanced extractor"""
         print("🔍 Searching for waterfront footage patterns with enhanced features...")
         
@@ -451,8 +559,13 @@ class WaterfrontFootageFinderV4:
         if not content:
             return []
         
-        # Extract matches using the enhanced extractor
-        self.results = extract_matches(content)
+        # Extract matches using the enhanced extractor (in parallel for large files)
+        try:
+            with content:
+                self.results = extract_matches_mapped(self.export_file, content)
+        except Exception as e:
+            print(f"❌ Error extracting matches: {e}")
+            return []
         
         print(f"✅ Found {len(self.results)} waterfront property records")
         return self.results
@@ -465,35 +578,47 @@ class WaterfrontFootageFinderV4:
         
         print("📊 Analyzing extracted waterfront features...")
         
-        analysis = {
-            'total_properties': len(self.results),
-            'properties_with_waterfront': len([r for r in self.results if r['waterfront_linear_ft']]),
-            'properties_with_docks': len([r for r in self.results if r['dock_linear_ft']]),
-            'properties_with_slips': len([r for r in self.results if r['slip_count']]),
-            'properties_with_lifts': len([r for r in self.results if r['lift_capacity_lbs']]),
-            'properties_with_depth': len([r for r in self.results if r['depth_at_mlw_ft']]),
-            'properties_no_fixed_bridges': len([r for r in self.results if r['no_fixed_bridges']]),
-            'waterfront_types': defaultdict(int),
-            'sample_properties': []
+        # Summary key -> row field counted when truthy
+        counted = {
+            'properties_with_waterfront': 'waterfront_linear_ft',
+            'properties_with_docks': 'dock_linear_ft',
+            'properties_with_slips': 'slip_count',
+            'properties_with_lifts': 'lift_capacity_lbs',
+            'properties_with_depth': 'depth_at_mlw_ft',
+            'properties_no_fixed_bridges': 'no_fixed_bridges',
         }
+        counts = dict.fromkeys(counted, 0)
+        waterfront_types = defaultdict(int)
+        sample_properties = []
         
-        # Analyze each property
+        # Analyze each property in a single pass
         for result in self.results:
+            for key, field in counted.items():
+                if getattr(result, field):
+                    counts[key] += 1
+            
             # Track waterfront types
-            if result['waterfront_type']:
-                analysis['waterfront_types'][result['waterfront_type']] += 1
+            if result.waterfront_type:
+                waterfront_types[result.waterfront_type] += 1
             
             # Add to sample properties (first 20)
-            if len(analysis['sample_properties']) < 20:
-                analysis['sample_properties'].append({
-                    'zpid': result['line_id'],
-                    'snippet': result['snippet'],
-                    'waterfront_ft': result['waterfront_linear_ft'],
-                    'dock_ft': result['dock_linear_ft'],
-                    'slip_count': result['slip_count'],
-                    'waterfront_type': result['waterfront_type']
+            if len(sample_properties) < 20:
+                sample_properties.append({
+                    'zpid': result.line_id,
+                    'snippet': result.snippet,
+                    'waterfront_ft': result.waterfront_linear_ft,
+                    'dock_ft': result.dock_linear_ft,
+                    'slip_count': result.slip_count,
+                    'waterfront_type': result.waterfront_type
                 })
         
+        analysis = {
+            'total_properties': len(self.results),
+            **counts,
+            'waterfront_types': waterfront_types,
+            'sample_properties': sample_properties
+        }
+        
         self.summary = analysis
         return analysis
     
@@ -533,12 +658,15 @@ class WaterfrontFootageFinderV4:
         
         # Save JSON
         json_file = output_file.replace('.csv', '.json') if output_file else f"waterfront_features_v4_{len(self.results)}_properties.json"
+        payload = {'summary': self.summary, 'detailed_results': self.results}
         try:
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'summary': self.summary,
-                    'detailed_results': self.results
-                }, f, indent=2, ensure_ascii=False)
+            # Rows are converted as the encoder reaches them (no list of dicts up front)
+            if orjson is not None:
+                with open(json_file, 'wb') as f:
+                    f.write(orjson.dumps(payload, default=WaterfrontRow.as_dict, option=orjson.OPT_INDENT_2))
+            else:
+                with open(json_file, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, default=WaterfrontRow.as_dict, indent=2, ensure_ascii=False)
             print(f"✅ JSON results saved to: {json_file}")
         except Exception as e:
             print(f"❌ Error saving JSON: {e}")
@@ -546,8 +674,11 @@ class WaterfrontFootageFinderV4:
         # Save CSV
         csv_file = output_file or f"waterfront_features_v4_{len(self.results)}_properties.csv"
         try:
-            df = pd.DataFrame(self.results)
-            df.to_csv(csv_file, index=False)
+            # Stream rows straight out; same layout pandas' to_csv produced
+            with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(ROW_FIELDS)
+                writer.writerows(r.as_tuple() for r in self.results)
             print(f"✅ CSV results saved to: {csv_file}")
         except Exception as e:
             print(f"❌ Error saving CSV: {e}")
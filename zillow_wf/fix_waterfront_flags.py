@@ -4,20 +4,103 @@ Fix Waterfront Flags Script
 Update the is_waterfront field in listings_summary based on data already extracted to listings_detail.
 """
 
-import psycopg
-import json
-from typing import List, Dict, Any
+from db_pool import apply_migrations, get_pool
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Tuple
+
+# Detail rows that indicate a waterfront property
+WATERFRONT_PREDICATE_SQL = """
+    ((d.waterfront_features IS NOT NULL AND d.waterfront_features != '[]' AND d.waterfront_features != 'null')
+     OR (d.water_view IS NOT NULL AND d.water_view != 'null')
+     -- One case-insensitive substring regex, served by the trigram index
+     OR d.description_raw ~* 'waterfront|ocean|canal|river|lake|bay|dock|boat|marina')
+"""
+
+# Set-based flag update for an explicit list of zpids (one text[] parameter)
+FLAG_ZPIDS_SQL = """
+    UPDATE listings_summary AS s
+    SET is_waterfront = true, updated_at = CURRENT_TIMESTAMP
+    FROM unnest(%s::text[]) AS v(zpid)
+    WHERE s.zpid = v.zpid AND s.is_waterfront IS DISTINCT FROM true
+"""
+
+# Very large shards are staged with COPY into a temp table instead of one huge array
+COPY_MIN_ZPIDS = 100000
+
+FLAG_STAGED_ZPIDS_SQL = """
+    UPDATE listings_summary AS s
+    SET is_waterfront = true, updated_at = CURRENT_TIMESTAMP
+    FROM wf_zpids AS v
+    WHERE s.zpid = v.zpid AND s.is_waterfront IS DISTINCT FROM true
+"""
+
+# Below this many zpids one statement beats fanning out across connections
+SHARD_MIN_ZPIDS = 20000
+
+WATERFRONT_TOTAL_SQL = "SELECT COUNT(*) FROM listings_summary WHERE is_waterfront = true"
+
+# (keyword, type) in priority order for each source column
+FEATURE_TYPES = [('ocean', 'Oceanfront'), ('canal', 'Canal'), ('river', 'Riverfront'),
+                 ('lake', 'Lakefront'), ('bay', 'Bayfront'), ('waterfront', 'Waterfront')]
+VIEW_TYPES = [('ocean', 'Ocean View'), ('canal', 'Canal View'), ('water', 'Water View')]
+DESCRIPTION_TYPES = [('ocean', 'Ocean Access'), ('canal', 'Canal Access'), ('river', 'River Access'),
+                     ('lake', 'Lake Access'), ('bay', 'Bay Access'), ('dock', 'Boat Access'),
+                     ('boat', 'Boat Access')]
+
+def _waterfront_type_sql() -> str:
+    """Build the CASE expression that classifies a detail row from the type tables"""
+    whens = [
+        "WHEN COALESCE(d.waterfront_features, '') = '' AND COALESCE(d.water_view, '') = ''"
+        " AND COALESCE(d.description_raw, '') = '' THEN 'Unknown'"
+    ]
+    for column, table in (('d.waterfront_features', FEATURE_TYPES),
+                          ('d.water_view', VIEW_TYPES),
+                          ('d.description_raw', DESCRIPTION_TYPES)):
+        whens += [f"WHEN lower({column}) LIKE '%{keyword}%' THEN '{waterfront_type}'"
+                  for keyword, waterfront_type in table]
+    return "CASE " + " ".join(whens) + " ELSE 'Waterfront' END"
+
+# First matching keyword wins: features, then view, then description
+WATERFRONT_TYPE_SQL = _waterfront_type_sql()
+
+# Summary queries, so the report never needs the candidate rows in Python
+TYPE_COUNTS_SQL = f"""
+    SELECT {WATERFRONT_TYPE_SQL} AS waterfront_type, COUNT(*)
+    FROM listings_summary s
+    JOIN listings_detail d ON s.zpid = d.zpid
+    WHERE {WATERFRONT_PREDICATE_SQL}
+    GROUP BY 1
+    ORDER BY 2 DESC, 1
+"""
+
+TOP_PRICED_SQL = f"""
+    SELECT s.zpid, s.address, s.city, s.state, s.price,
+           {WATERFRONT_TYPE_SQL} AS waterfront_type
+    FROM listings_summary s
+    JOIN listings_detail d ON s.zpid = d.zpid
+    WHERE {WATERFRONT_PREDICATE_SQL}
+    ORDER BY s.price DESC NULLS LAST
+    LIMIT 5
+"""
+
+SUMMARY_COLUMNS = ['zpid', 'address', 'city', 'state', 'price', 'waterfront_type']
 
 class WaterfrontFlagFixer:
     def __init__(self, connection_string: str = 'postgresql://osamabedier@localhost:5432/zillow_wf'):
         self.connection_string = connection_string
+        self.pool = None
         self.conn = None
         self.cur = None
+        self.max_workers = 4
     
     def connect(self):
         """Establish database connection"""
         try:
-            self.conn = psycopg.connect(self.connection_string)
+            # Pooled so repeated runs in one process reuse the connection; pooled
+            # connections are autocommit, so writes go through conn.transaction()
+            # One connection for this fixer plus one per update shard
+            self.pool = get_pool(self.connection_string, max_size=self.max_workers + 1)
+            self.conn = self.pool.getconn()
             self.cur = self.conn.cursor()
             print("✅ Connected to database successfully")
             return True
@@ -29,162 +112,130 @@ class WaterfrontFlagFixer:
         """Close database connection"""
         if self.cur:
             self.cur.close()
+            self.cur = None
         if self.conn:
-            self.conn.close()
-        print("🔌 Database connection closed")
+            # The pool rolls back any open transaction on return
+            self.pool.putconn(self.conn)
+            self.conn = None
+        print("🔌 Database connection released")
     
     def find_waterfront_properties(self) -> List[Dict[str, Any]]:
         """Find properties that should be marked as waterfront based on detail data"""
         print("🔍 Finding properties with waterfront indicators...")
         
-        self.cur.execute("""
-            SELECT 
-                s.zpid,
-                s.address,
-                s.city,
-                s.state,
-                s.price,
-                d.waterfront_features,
-                d.water_view,
-                d.description_raw
-            FROM listings_summary s
-            JOIN listings_detail d ON s.zpid = d.zpid
-            WHERE (d.waterfront_features IS NOT NULL AND d.waterfront_features != '[]' AND d.waterfront_features != 'null')
-               OR (d.water_view IS NOT NULL AND d.water_view != 'null')
-               OR (d.description_raw IS NOT NULL AND (
-                   LOWER(d.description_raw) LIKE '%waterfront%'
-                   OR LOWER(d.description_raw) LIKE '%ocean%'
-                   OR LOWER(d.description_raw) LIKE '%canal%'
-                   OR LOWER(d.description_raw) LIKE '%river%'
-                   OR LOWER(d.description_raw) LIKE '%lake%'
-                   OR LOWER(d.description_raw) LIKE '%bay%'
-                   OR LOWER(d.description_raw) LIKE '%dock%'
-                   OR LOWER(d.description_raw) LIKE '%boat%'
-                   OR LOWER(d.description_raw) LIKE '%marina%'
-               ))
-            ORDER BY s.price DESC
-        """)
-        
-        results = self.cur.fetchall()
         waterfront_properties = []
         
-        for row in results:
-            zpid, address, city, state, price, waterfront_features, water_view, description = row
+        # Classified in SQL, so the (large) description text never leaves the server;
+        # the server-side cursor streams rows in itersize batches instead of fetchall()
+        # and needs a transaction to live in
+        with self.conn.transaction(), self.conn.cursor(name='wf_scan') as cur:
+            cur.itersize = 5000
+            cur.execute(f"""
+                SELECT 
+                    s.zpid,
+                    s.address,
+                    s.city,
+                    s.state,
+                    s.price,
+                    d.waterfront_features,
+                    d.water_view,
+                    {WATERFRONT_TYPE_SQL} AS waterfront_type
+                FROM listings_summary s
+                JOIN listings_detail d ON s.zpid = d.zpid
+                WHERE {WATERFRONT_PREDICATE_SQL}
+                ORDER BY s.price DESC
+            """)
             
-            # Determine waterfront type
-            waterfront_type = self._classify_waterfront_type(waterfront_features, water_view, description)
-            
-            waterfront_properties.append({
-                'zpid': zpid,
-                'address': address,
-                'city': city,
-                'state': state,
-                'price': price,
-                'waterfront_features': waterfront_features,
-                'water_view': water_view,
-                'waterfront_type': waterfront_type
-            })
+            for row in cur:
+                zpid, address, city, state, price, waterfront_features, water_view, waterfront_type = row
+                
+                waterfront_properties.append({
+                    'zpid': zpid,
+                    'address': address,
+                    'city': city,
+                    'state': state,
+                    'price': price,
+                    'waterfront_features': waterfront_features,
+                    'water_view': water_view,
+                    'waterfront_type': waterfront_type
+                })
         
         return waterfront_properties
     
-    def _classify_waterfront_type(self, waterfront_features: str, water_view: str, description: str) -> str:
-        """Classify the type of waterfront property"""
-        if not waterfront_features and not water_view and not description:
-            return "Unknown"
-        
-        # Check for specific waterfront types
-        if waterfront_features:
-            features_str = str(waterfront_features).lower()
-            if 'ocean' in features_str or 'oceanfront' in features_str:
-                return "Oceanfront"
-            elif 'canal' in features_str:
-                return "Canal"
-            elif 'river' in features_str:
-                return "Riverfront"
-            elif 'lake' in features_str:
-                return "Lakefront"
-            elif 'bay' in features_str:
-                return "Bayfront"
-            elif 'waterfront' in features_str:
-                return "Waterfront"
-        
-        if water_view:
-            view_str = str(water_view).lower()
-            if 'ocean' in view_str:
-                return "Ocean View"
-            elif 'canal' in view_str:
-                return "Canal View"
-            elif 'water' in view_str:
-                return "Water View"
-        
-        if description:
-            desc_str = str(description).lower()
-            if 'ocean' in desc_str or 'oceanfront' in desc_str:
-                return "Ocean Access"
-            elif 'canal' in desc_str:
-                return "Canal Access"
-            elif 'river' in desc_str:
-                return "River Access"
-            elif 'lake' in desc_str:
-                return "Lake Access"
-            elif 'bay' in desc_str:
-                return "Bay Access"
-            elif 'dock' in desc_str or 'boat' in desc_str:
-                return "Boat Access"
-        
-        return "Waterfront"
-    
     def update_waterfront_flags(self, waterfront_properties: List[Dict[str, Any]]) -> Dict[str, int]:
         """Update the is_waterfront field in listings_summary"""
         print(f"🔄 Updating waterfront flags for {len(waterfront_properties)} properties...")
         
-        updated_count = 0
-        error_count = 0
-        
-        for prop in waterfront_properties:
-            try:
-                # Update the is_waterfront flag
-                self.cur.execute("""
-                    UPDATE listings_summary 
-                    SET is_waterfront = true, updated_at = CURRENT_TIMESTAMP
-                    WHERE zpid = %s
-                """, (prop['zpid'],))
-                
-                updated_count += 1
-                print(f"✅ Updated ZPID {prop['zpid']}: {prop['waterfront_type']} - {prop['address']}")
-                
-            except Exception as e:
-                error_count += 1
-                print(f"❌ Error updating ZPID {prop['zpid']}: {e}")
+        zpids = [prop['zpid'] for prop in waterfront_properties]
         
-        # Commit the changes
-        self.conn.commit()
+        if len(zpids) < SHARD_MIN_ZPIDS or self.max_workers < 2:
+            results = [self._update_shard(self.conn, zpids)]
+        else:
+            # Disjoint shards by zpid hash, each updated on its own pooled connection
+            shards = [[] for _ in range(self.max_workers)]
+            for zpid in zpids:
+                shards[hash(zpid) % self.max_workers].append(zpid)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(self._update_pooled_shard, shards))
         
         return {
-            'updated': updated_count,
-            'errors': error_count
+            'updated': sum(updated for updated, _ in results),
+            'errors': sum(errors for _, errors in results)
         }
     
-    def show_waterfront_summary(self, waterfront_properties: List[Dict[str, Any]]):
-        """Show a summary of waterfront properties found"""
+    def _update_pooled_shard(self, zpids: List[str]) -> Tuple[int, int]:
+        """Flag one shard of zpids on a connection borrowed from the pool"""
+        with self.pool.connection() as conn:
+            return self._update_shard(conn, zpids)
+    
+    def _update_shard(self, conn, zpids: List[str]) -> Tuple[int, int]:
+        """Flag zpids in one set-based UPDATE and return (updated, errors)"""
+        try:
+            # The transaction commits on success and rolls back on error
+            with conn.transaction():
+                if len(zpids) < COPY_MIN_ZPIDS:
+                    return conn.execute(FLAG_ZPIDS_SQL, (zpids,), prepare=True).rowcount, 0
+                
+                cur = conn.cursor()
+                cur.execute("CREATE TEMP TABLE wf_zpids (zpid text) ON COMMIT DROP")
+                with cur.copy("COPY wf_zpids (zpid) FROM STDIN") as copy:
+                    for zpid in zpids:
+                        copy.write_row((zpid,))
+                # Give the planner real row counts for the join
+                cur.execute("ANALYZE wf_zpids")
+                cur.execute(FLAG_STAGED_ZPIDS_SQL)
+                return cur.rowcount, 0
+        except Exception as e:
+            print(f"❌ Error updating waterfront flags: {e}")
+            return 0, len(zpids)
+    
+    def _send_summary_queries(self) -> Tuple[Any, Any]:
+        """Send the type-count and top-5 summary queries; returns their cursors"""
+        counts_cur, top_cur = self.conn.cursor(), self.conn.cursor()
+        counts_cur.execute(TYPE_COUNTS_SQL)
+        top_cur.execute(TOP_PRICED_SQL)
+        return counts_cur, top_cur
+    
+    def _show_summary_from(self, counts_cur, top_cur):
+        """Print the summary from the cursors returned by _send_summary_queries"""
+        type_counts = counts_cur.fetchall()
+        top_properties = [dict(zip(SUMMARY_COLUMNS, row)) for row in top_cur]
+        self._print_waterfront_summary(type_counts, top_properties)
+    
+    def _print_waterfront_summary(self, type_counts: List[Tuple[str, int]],
+                                  top_properties: List[Dict[str, Any]]):
+        """Print type counts (largest first) and the top properties by price"""
         print(f"\n🌊 WATERFRONT PROPERTIES SUMMARY")
         print("=" * 60)
-        print(f"Total Properties Found: {len(waterfront_properties)}")
-        
-        # Group by waterfront type
-        type_counts = {}
-        for prop in waterfront_properties:
-            prop_type = prop['waterfront_type']
-            type_counts[prop_type] = type_counts.get(prop_type, 0) + 1
+        print(f"Total Properties Found: {sum(count for _, count in type_counts)}")
         
         print(f"\nWaterfront Types:")
-        for prop_type, count in sorted(type_counts.items(), key=lambda x: x[1], reverse=True):
+        for prop_type, count in type_counts:
             print(f"  {prop_type}: {count} properties")
         
         # Show top properties by price
         print(f"\nTop 5 Waterfront Properties by Price:")
-        sorted_props = sorted(waterfront_properties, key=lambda x: x['price'] or 0, reverse=True)
-        for i, prop in enumerate(sorted_props[:5], 1):
+        for i, prop in enumerate(top_properties, 1):
             price_str = f"${prop['price']:,}" if prop['price'] else "Price not available"
             print(f"  {i}. ZPID {prop['zpid']}: {prop['address']}, {prop['city']}, {prop['state']}")
             print(f"     {prop['waterfront_type']} - {price_str}")
@@ -196,6 +247,7 @@ class WaterfrontFlagFixer:
         
         try:
             print("🚀 Starting Waterfront Flag Fix Process...")
+            apply_migrations(self.conn)
             
             # Step 1: Find properties with waterfront indicators
             waterfront_properties = self.find_waterfront_properties()
@@ -204,8 +256,10 @@ class WaterfrontFlagFixer:
                 print("❌ No waterfront properties found in detail data")
                 return
             
-            # Step 2: Show summary
-            self.show_waterfront_summary(waterfront_properties)
+            # Step 2: Show summary (aggregated in SQL, both queries in one round trip)
+            with self.conn.pipeline():
+                summary_cursors = self._send_summary_queries()
+            self._show_summary_from(*summary_cursors)
             
             # Step 3: Update waterfront flags
             results = self.update_waterfront_flags(waterfront_properties)
@@ -216,8 +270,54 @@ class WaterfrontFlagFixer:
             print(f"  Errors: {results['errors']}")
             
             # Step 4: Verify the update
-            self.cur.execute("SELECT COUNT(*) FROM listings_summary WHERE is_waterfront = true")
-            waterfront_count = self.cur.fetchone()[0]
+            self._show_waterfront_total()
+            
+        except Exception as e:
+            print(f"❌ Error during waterfront flag fix: {e}")
+        finally:
+            self.disconnect()
+    
+    def _show_waterfront_total(self):
+        """Print how many listings are flagged as waterfront"""
+        self.cur.execute(WATERFRONT_TOTAL_SQL)
+        waterfront_count = self.cur.fetchone()[0]
+        print(f"  Total waterfront properties in database: {waterfront_count}")
+    
+    def run_fix_fast(self, show_summary: bool = False):
+        """Find and flag waterfront properties in a single UPDATE ... FROM statement"""
+        if not self.connect():
+            return
+        
+        try:
+            print("🚀 Starting Waterfront Flag Fix Process (single statement)...")
+            apply_migrations(self.conn)
+            
+            # Send BEGIN, the summary queries, the UPDATE, the verification count and
+            # COMMIT in one round trip; the count runs in the same transaction, so it
+            # sees the update. The candidate set depends only on listings_detail, so
+            # the summary is the same before or after the update.
+            update_cur, count_cur = self.conn.cursor(), self.conn.cursor()
+            with self.conn.pipeline(), self.conn.transaction():
+                if show_summary:
+                    summary_cursors = self._send_summary_queries()
+                update_cur.execute(f"""
+                    UPDATE listings_summary AS s
+                    SET is_waterfront = true, updated_at = CURRENT_TIMESTAMP
+                    FROM listings_detail d
+                    WHERE s.zpid = d.zpid AND {WATERFRONT_PREDICATE_SQL}
+                      -- Already-flagged rows are skipped, so re-runs only write what changed
+                      AND s.is_waterfront IS DISTINCT FROM true
+                """)
+                count_cur.execute(WATERFRONT_TOTAL_SQL)
+            updated_count = update_cur.rowcount
+            waterfront_count = count_cur.fetchone()[0]
+            
+            if show_summary:
+                self._show_summary_from(*summary_cursors)
+            
+            print(f"\n✅ Waterfront flag fix completed!")
+            print(f"📊 Results:")
+            print(f"  Properties newly flagged: {updated_count}")
             print(f"  Total waterfront properties in database: {waterfront_count}")
             
         except Exception as e:
@@ -228,7 +328,7 @@ class WaterfrontFlagFixer:
 def main():
     """Main function to run the waterfront flag fixer"""
     fixer = WaterfrontFlagFixer()
-    fixer.run_fix()
+    fixer.run_fix_fast(show_summary=True)
 
 if __name__ == "__main__":
     main()
@@ -17,20 +17,57 @@ import json
 import re
 import base64
 from pathlib import Path
-from typing import Any, Dict, Optional, List, Set, Tuple, Union
+from typing import Any, Awaitable, Callable, Dict, Optional, List, Set, Tuple, Union
 import logging
 import os
+import sys
 from dotenv import load_dotenv
 from datetime import datetime
 import hashlib
+import copy
+import threading
+from functools import lru_cache
 from sqlalchemy import create_engine, text
 import time
 from tqdm import tqdm
 import argparse
 import glob
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from rbloom import Bloom
+except ImportError:
+    Bloom = None
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Set up logging
+import atexit
 import logging.handlers
+from queue import SimpleQueue
 
 # Create logs directory if it doesn't exist
 log_dir = Path('zillow_wf/logs')
@@ -55,17 +92,96 @@ console_handler.setFormatter(formatter)
 # Set up root logger
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+
+# Log calls only enqueue the record; a listener thread formats and writes it
+log_queue = SimpleQueue()
+log_listener = logging.handlers.QueueListener(
+    log_queue, file_handler, console_handler, respect_handler_level=True
+)
+log_listener.start()
+atexit.register(log_listener.stop)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
 # Suppress SQLAlchemy logging (SQL queries)
 logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
 logging.getLogger('sqlalchemy.pool').setLevel(logging.WARNING)
 
+_NEXT_DATA_RE = re.compile(r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>', re.DOTALL)
+
+def loads_json(text: str) -> Any:
+    """Parse JSON with orjson when available, falling back to the stdlib parser"""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity or integers beyond 64 bits; json accepts those
+            pass
+    return json.loads(text)
+
+def keyword_matcher(keywords: List[str]) -> Callable[[str], bool]:
+    """Return a test for whether lowercased text contains any of keywords"""
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    return lambda text: any(keyword in text for keyword in keywords)
+
+# Keyword tests run on every string in the property JSON and on the description
+has_waterfront_info = keyword_matcher(['waterfront', 'ocean', 'intracoastal', 'canal', 'dock',
+                                       'boat', 'marina', 'slip', 'bridge', 'depth'])
+has_waterfront_description = keyword_matcher(['waterfront', 'ocean', 'canal', 'river',
+                                              'lake', 'bay', 'dock'])
+has_boat_access = keyword_matcher(['dock', 'boat', 'marina'])
+
+# Past this many known ZPIDs (and with a database to confirm hits) keep a ~1.2 MB
+# per million Bloom filter instead of a set
+BLOOM_MIN_ZPIDS = 1_000_000
+BLOOM_FALSE_POSITIVE_RATE = 0.01
+
+# Redraw progress bars at most twice a second; per-item redraws cost a TTY write each
+PROGRESS_MININTERVAL = 0.5
+
+# Saved HTML is zstd-compressed (level 3) when zstandard is installed
+HTML_ZSTD_LEVEL = 3
+
+# Literal (compile-time interned) keys rather than per-property f-strings
+COORD_FIELDS = (
+    ('latitude', 'coord_latitude'), ('longitude', 'coord_longitude'),
+    ('lat', 'coord_lat'), ('lon', 'coord_lon'), ('lng', 'coord_lng'),
+)
+
+# One row per (zpid, content_type); executed with a list of rows per property
+TEXT_CONTENT_UPSERT_SQL = text('''
+    INSERT INTO listing_text_content (zpid, content_type, content_full, content_preview)
+    VALUES (:zpid, :content_type, :content_full, :content_preview)
+    ON CONFLICT (zpid, content_type) DO UPDATE SET
+        content_full = EXCLUDED.content_full,
+        content_preview = EXCLUDED.content_preview
+''')
+
+PHOTO_INSERT_SQL = text('''
+    INSERT INTO property_photos (zpid, caption, main_url, jpeg_resolutions, webp_resolutions, photo_order)
+    VALUES (:zpid, :caption, :main_url, :jpeg_resolutions, :webp_resolutions, :photo_order)
+''')
+
+@lru_cache(maxsize=None)
+def split_path(path: str) -> Tuple[str, ...]:
+    """Split a dotted JSON path once; later lookups reuse the tuple"""
+    return tuple(path.split('.'))
+
+def zpid_key(zpid: Union[int, str]) -> Union[int, str]:
+    """Normalise a ZPID to the key stored in existing_zpids (numeric ZPIDs as int)"""
+    if isinstance(zpid, int):
+        return zpid
+    zpid = str(zpid)
+    return int(zpid) if zpid.isdecimal() else zpid
+
 class FlexibleWaterfrontExtractor:
     """Flexible extractor for waterfront properties with deep JSON searching and direct DB storage"""
     
-    def __init__(self, api_key: str = None, enable_db_storage: bool = False, timeout_seconds: int = 30, cache_mode: bool = False, max_search_pages: int = 20, max_properties_per_search: int = 1000, save_html: bool = False, save_processed: bool = False, save_next_data: bool = False, save_summary: bool = False, save_cache: bool = True, simple_logging: bool = False, max_concurrent_properties: int = 5, save_urls_list: bool = False, continue_from_file: str = None):
+    def __init__(self, api_key: str = None, enable_db_storage: bool = False, timeout_seconds: int = 30, cache_mode: bool = False, max_search_pages: int = 20, max_properties_per_search: int = 1000, save_html: bool = False, save_processed: bool = False, save_next_data: bool = False, save_summary: bool = False, save_cache: bool = True, simple_logging: bool = False, max_concurrent_properties: int = 5, save_urls_list: bool = False, continue_from_file: str = None, emit_progress: bool = False, low_memory: bool = False):
         # Load environment variables (prefer .env.local if present)
         load_dotenv('.env.local')
         load_dotenv('.env')
@@ -92,31 +208,37 @@ class FlexibleWaterfrontExtractor:
         self.max_concurrent_properties = max_concurrent_properties
         self.save_urls_list = save_urls_list
         self.continue_from_file = continue_from_file
-        self.counters = {
-            'search_results_found': 0,
-            'properties_scraped': 0,
-            'properties_extracted': 0,
-            'properties_added': 0,
-            'properties_updated': 0,
-            'properties_skipped': 0,
-            'errors': 0
-        }
-        
-        # Field tracking for completion analysis
-        self.field_tracker = {
-            'total_properties': 0,
-            'fields_found': {},
-            'fields_missing': set(),
-            'field_completion': {}
-        }
+        self.emit_progress = emit_progress
+        # Stream cache files with ijson instead of decoding them whole
+        self.low_memory = low_memory
+        if low_memory and ijson is None:
+            logger.warning("⚠️ ijson not installed, low-memory cache loading disabled")
+        # Shared HTTP client (keep-alive pool), created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+        # (html, script text) of the last __NEXT_DATA__ search; each page is searched three times
+        self._next_data_match: Optional[Tuple[str, Optional[str]]] = None
+        # Appended to run report file names so concurrent runs don't overwrite each other
+        self.run_suffix = ''
+        self._reset_run_state()
         
         # Load existing ZPIDs to avoid duplicate scraping
         self.existing_zpids = set()
+        # False when existing_zpids is a Bloom filter whose hits need confirming
+        self._existing_zpids_exact = True
         # Create data_dir if it doesn't exist
         self.data_dir = Path('data')
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
-        # Load existing ZPIDs (this will also initialize database if needed)
+        # Database connection (needed before loading existing ZPIDs)
+        if enable_db_storage:
+            database_url = os.getenv('DATABASE_URL', 'postgresql+psycopg://osamabedier@localhost:5432/zillow_wf')
+            self.db_engine = create_engine(database_url, pool_pre_ping=True, pool_recycle=300)
+            logger.info(f"🗄️ Database storage enabled: {database_url}")
+        else:
+            self.db_engine = None
+            logger.info("🗄️ Database storage disabled")
+        
+        # Load existing ZPIDs from the database (or the file fallback)
         self._load_existing_zpids()
         
         # Define field mappings for database updates
@@ -200,15 +322,6 @@ class FlexibleWaterfrontExtractor:
         
         logger.info(f"⏱️ Timeout set to {self.timeout_seconds} seconds")
         
-        # Database connection
-        if enable_db_storage:
-            database_url = os.getenv('DATABASE_URL', 'postgresql+psycopg://osamabedier@localhost:5432/zillow_wf')
-            self.db_engine = create_engine(database_url, pool_pre_ping=True, pool_recycle=300)
-            logger.info(f"🗄️ Database storage enabled: {database_url}")
-        else:
-            self.db_engine = None
-            logger.info("🗄️ Database storage disabled")
-        
         # Standard data directories
         root = Path('.')
         self.data_dir = root / 'zillow_wf' / 'data'
@@ -219,6 +332,7 @@ class FlexibleWaterfrontExtractor:
         self.summary_dir = self.data_dir / 'summary'
         for d in [self.html_dir, self.next_dir, self.cache_dir, self.processed_dir, self.summary_dir]:
             d.mkdir(parents=True, exist_ok=True)
+        self._html_compressor = zstd.ZstdCompressor(level=HTML_ZSTD_LEVEL) if zstd else None
         
         # Waterfront keywords to search for
         self.waterfront_keywords = {
@@ -354,84 +468,164 @@ class FlexibleWaterfrontExtractor:
     
     def _track_field_completion(self, property_data: Dict[str, Any]):
         """Track which fields were found for this property"""
-        # Add property data to tracking
-        if 'properties_processed' not in self.field_tracker:
-            self.field_tracker['properties_processed'] = []
-        self.field_tracker['properties_processed'].append(property_data)
-        self.field_tracker['total_properties'] = len(self.field_tracker['properties_processed'])
+        # Count the property instead of keeping it; the report only needs the counters
+        with self._tracker_lock:
+            self.field_tracker['total_properties'] += 1
+            if property_data.get('_database_stored', False):
+                self.field_tracker['db_success_count'] += 1
+            else:
+                self.field_tracker['unstored_zpids'].add(property_data.get('zpid'))
         
-        for field_name, field_paths in self.expected_fields.items():
+        fields_found = self.field_tracker['fields_found']
+        fields_missing = self.field_tracker['fields_missing']
+        for field_name in self.expected_fields:
             # Check if field exists and has non-empty value
             value = property_data.get(field_name)
             if value is not None and value != '' and value != [] and value != {}:
-                self.field_tracker['fields_found'][field_name] += 1
+                fields_found[field_name] += 1
             else:
                 # Track missing field for this property
-                if field_name not in self.field_tracker['fields_missing']:
-                    self.field_tracker['fields_missing'].add(field_name)
-        
-        # Update completion percentages
-        for field in self.field_tracker['fields_found']:
-            if self.field_tracker['total_properties'] > 0:
-                self.field_tracker['field_completion'][field] = (
-                    self.field_tracker['fields_found'][field] / self.field_tracker['total_properties']
-                ) * 100
+                fields_missing.add(field_name)
+        
+        # Completion percentages are derived from fields_found when the report is built
     
     def _load_existing_zpids(self):
         """Load existing ZPIDs from the database to avoid duplicate scraping"""
         try:
-            if self.enable_db_storage and hasattr(self, 'db_engine'):
-                # Query database directly for existing ZPIDs
+            if self.db_engine is not None:
+                # Query database directly for existing ZPIDs, streamed into a set of ints
                 with self.db_engine.connect() as conn:
-                    result = conn.execute(text("SELECT zpid FROM listings_summary"))
-                    zpids = [str(row[0]) for row in result.fetchall()]
-                    self.existing_zpids = set(zpids)
-                    logger.info(f"📋 Loaded {len(self.existing_zpids)} existing ZPIDs from database")
+                    count = conn.execute(text("SELECT COUNT(*) FROM listings_summary")).scalar()
+                    result = conn.execution_options(stream_results=True).execute(
+                        text("SELECT zpid FROM listings_summary")
+                    )
+                    self._set_existing_zpids((row[0] for row in result), count)
+                    logger.info(f"📋 Loaded {count} existing ZPIDs from database")
             else:
                 # Fallback to file-based loading
                 zpids_file = self.data_dir / 'existing_zpids.json'
                 if zpids_file.exists():
                     with open(zpids_file, 'r') as f:
                         zpids = json.load(f)
-                        self.existing_zpids = set(zpids)
-                        logger.info(f"📋 Loaded {len(self.existing_zpids)} existing ZPIDs from {zpids_file}")
+                        self._set_existing_zpids(zpids, len(zpids))
+                        logger.info(f"📋 Loaded {len(zpids)} existing ZPIDs from {zpids_file}")
                 else:
                     logger.warning(f"⚠️ No existing ZPIDs file found at {zpids_file}")
         except Exception as e:
             logger.error(f"❌ Error loading existing ZPIDs: {e}")
             self.existing_zpids = set()
+            self._existing_zpids_exact = True
+    
+    def _set_existing_zpids(self, zpids, count: int):
+        """Hold known ZPIDs in a set, or a Bloom filter for very large histories"""
+        # Bloom hits are confirmed against the database, so only use one when it is available
+        if Bloom is not None and self.enable_db_storage and count >= BLOOM_MIN_ZPIDS:
+            bloom = Bloom(count * 2, BLOOM_FALSE_POSITIVE_RATE)
+            bloom.update(map(zpid_key, zpids))
+            self.existing_zpids = bloom
+            self._existing_zpids_exact = False
+            logger.info(f"📋 Using a Bloom filter for {count} existing ZPIDs")
+        else:
+            self.existing_zpids = set(map(zpid_key, zpids))
+            self._existing_zpids_exact = True
     
     def _is_property_already_scraped(self, zpid: str) -> bool:
         """Check if a property has already been scraped (legacy method - use _is_property_already_scraped_db instead)"""
-        return zpid in self.existing_zpids
+        if zpid_key(zpid) not in self.existing_zpids:
+            return False
+        if self._existing_zpids_exact or self.db_engine is None:
+            return True
+        
+        # Bloom filter hit: about 1% are false positives, so confirm in the database
+        try:
+            with self.db_engine.connect() as conn:
+                result = conn.execute(text("SELECT 1 FROM listings_summary WHERE zpid = :zpid"), {'zpid': str(zpid)})
+                return result.first() is not None
+        except Exception as e:
+            logger.error(f"Error confirming ZPID {zpid} in database: {e}")
+            return True
     
     def _simple_log(self, message: str):
         """Simple logging that just shows key progress updates"""
         if self.simple_logging:
             print(f"📊 {message}")
     
+    def _emit_progress(self, done: int, total: int, failed: int):
+        """Print a machine-readable progress line for the extraction runner"""
+        if self.emit_progress:
+            print(f"PROGRESS {done}/{total} failed={failed}", flush=True)
+    
     def _update_counter(self, counter_name: str, increment: int = 1):
         """Update counter and log if simple logging is enabled"""
         if counter_name in self.counters:
-            self.counters[counter_name] += increment
+            with self._tracker_lock:
+                self.counters[counter_name] += increment
+                value = self.counters[counter_name]
             if self.simple_logging:
-                self._simple_log(f"{counter_name.replace('_', ' ').title()}: {self.counters[counter_name]}")
+                self._simple_log(f"{counter_name.replace('_', ' ').title()}: {value}")
+
+    @staticmethod
+    def _write_urls_file(filename: str, search_url: str, urls: List[str]):
+        """Write a URLs list file with its header in a single write"""
+        header = (
+            f"# URLs extracted from: {search_url}\n"
+            f"# Extracted on: {datetime.now().isoformat()}\n"
+            f"# Total URLs: {len(urls)}\n\n"
+        )
+        with open(filename, 'w') as f:
+            f.write(header + ''.join(f"{url}\n" for url in urls))
+
+    def _store_urls_to_database(self, urls: List[str], search_url: str) -> int:
+        """Bulk-load extracted URLs into search_results, skipping known property URLs"""
+        with self.db_engine.begin() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS search_results (
+                    search_url TEXT,
+                    property_url TEXT PRIMARY KEY,
+                    extracted_at TIMESTAMPTZ DEFAULT NOW()
+                )
+            """))
+            conn.execute(text("""
+                CREATE TEMP TABLE search_results_stage (
+                    search_url TEXT,
+                    property_url TEXT
+                ) ON COMMIT DROP
+            """))
+            
+            # COPY into a stage table so duplicates can't abort the load
+            cursor = conn.connection.driver_connection.cursor()
+            with cursor.copy("COPY search_results_stage (search_url, property_url) FROM STDIN") as copy:
+                for url in urls:
+                    copy.write_row((search_url, url))
+            
+            result = conn.execute(text("""
+                INSERT INTO search_results (search_url, property_url)
+                SELECT DISTINCT ON (property_url) search_url, property_url
+                FROM search_results_stage
+                ON CONFLICT (property_url) DO NOTHING
+            """))
+            return result.rowcount
 
-    def _save_urls_list(self, urls: List[str], search_url: str):
-        """Save extracted URLs to a file for later continuation"""
+    async def _save_urls_list(self, urls: List[str], search_url: str):
+        """Save extracted URLs to a file for --continue (and to search_results with DB storage)"""
         if not self.save_urls_list:
             return
         
+        if self.db_engine is not None:
+            try:
+                inserted = await asyncio.to_thread(self._store_urls_to_database, urls, search_url)
+                logger.info(f"✅ Saved {inserted} new of {len(urls)} URLs to search_results")
+                if self.simple_logging:
+                    self._simple_log(f"Saved {inserted} new URLs to search_results")
+            except Exception as e:
+                logger.error(f"❌ Failed to save URLs to search_results: {e}")
+        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"data/urls_list_{timestamp}.txt"
         
         try:
-            with open(filename, 'w') as f:
-                f.write(f"# URLs extracted from: {search_url}\n")
-                f.write(f"# Extracted on: {datetime.now().isoformat()}\n")
-                f.write(f"# Total URLs: {len(urls)}\n\n")
-                for url in urls:
-                    f.write(f"{url}\n")
+            # Keep the blocking file write off the event loop
+            await asyncio.to_thread(self._write_urls_file, filename, search_url, urls)
             
             logger.info(f"✅ Saved {len(urls)} URLs to {filename}")
             if self.simple_logging:
@@ -486,25 +680,40 @@ class FlexibleWaterfrontExtractor:
             logger.error(f"Error checking database for ZPID {zpid}: {e}")
             return False  # If we can't check, assume it's new
     
+    async def _find_existing_zpids_db(self, zpids: List[str]) -> Set[str]:
+        """Return the subset of zpids already in the database, in one query"""
+        if not zpids:
+            return set()
+        try:
+            with self.db_engine.connect() as conn:
+                result = conn.execute(
+                    text("SELECT zpid FROM listings_summary WHERE zpid = ANY(:zpids)"),
+                    {'zpids': list(zpids)}
+                )
+                existing = {str(row[0]) for row in result}
+            logger.info(f"🔍 Database check for {len(zpids)} ZPIDs: {len(existing)} already stored")
+            self.existing_zpids.update(map(zpid_key, existing))
+            return existing
+        except Exception as e:
+            logger.error(f"Error checking database for {len(zpids)} ZPIDs: {e}")
+            return set()  # If we can't check, assume they're new
+    
     def _generate_completion_report(self) -> str:
         """Generate a comprehensive field completion report"""
         if not self.field_tracker:
             return "No field tracking data available"
         
-        total_properties = len(self.field_tracker.get('properties_processed', []))
+        total_properties = self.field_tracker['total_properties']
         if total_properties == 0:
             return "No properties processed yet"
         
-        # Calculate completion rates for each field
+        # Calculate completion rates for each field from the running counters
         field_stats = {}
         for field_name in self.expected_fields.keys():
-            found_count = sum(1 for prop_data in self.field_tracker['properties_processed'] 
-                            if prop_data.get(field_name) is not None and 
-                            prop_data.get(field_name) != '' and 
-                            prop_data.get(field_name) != [] and
-                            prop_data.get(field_name) != {})
+            found_count = self.field_tracker['fields_found'][field_name]
             
             completion_rate = (found_count / total_properties) * 100
+            self.field_tracker['field_completion'][field_name] = completion_rate
             field_stats[field_name] = {
                 'found_count': found_count,
                 'completion_rate': completion_rate
@@ -524,8 +733,7 @@ class FlexibleWaterfrontExtractor:
         overall_completion = sum(s['completion_rate'] for s in field_stats.values()) / len(field_stats)
         
         # Database success tracking
-        db_success_count = sum(1 for prop_data in self.field_tracker['properties_processed'] 
-                              if prop_data.get('_database_stored', False))
+        db_success_count = self.field_tracker['db_success_count']
         db_success_rate = (db_success_count / total_properties) * 100 if total_properties > 0 else 0
         
         report = f"""================================================================================
@@ -582,6 +790,75 @@ class FlexibleWaterfrontExtractor:
 """
         return report
     
+    def _reset_run_state(self):
+        """Start fresh counters and field tracking for a run"""
+        # store_property_to_database runs in worker threads (asyncio.to_thread)
+        # and updates these alongside the event loop
+        self._tracker_lock = threading.Lock()
+        self.counters = {
+            'search_results_found': 0,
+            'properties_scraped': 0,
+            'properties_extracted': 0,
+            'properties_added': 0,
+            'properties_updated': 0,
+            'properties_skipped': 0,
+            'errors': 0
+        }
+        
+        # Field tracking for completion analysis
+        self.field_tracker = {
+            'total_properties': 0,
+            'fields_found': {},
+            'fields_missing': set(),
+            'field_completion': {},
+            'db_success_count': 0,
+            # Tracked properties not (yet) stored, so a later store can still be counted
+            'unstored_zpids': set()
+        }
+    
+    def fork(self, run_suffix: str = '') -> 'FlexibleWaterfrontExtractor':
+        """Return an extractor for one concurrent run with its own counters and reports
+        
+        The fork shares this extractor's HTTP client, database engine and existing
+        ZPIDs; close only the original.
+        """
+        self._get_client()
+        forked = copy.copy(self)
+        forked._next_data_match = None
+        forked.run_suffix = run_suffix
+        forked._reset_run_state()
+        forked._initialize_field_tracking()
+        return forked
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it if needed"""
+        if self._client is None or self._client.is_closed:
+            # Keep a warm connection per concurrent fetch; with HTTP/2 the
+            # concurrent Zyte requests share one multiplexed connection
+            self._client = httpx.AsyncClient(
+                auth=(self.api_key, "") if self.api_key else None,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=max(20, self.max_concurrent_properties * 2),
+                    max_connections=max(100, self.max_concurrent_properties * 2)
+                ),
+                timeout=httpx.Timeout(self.timeout_seconds, connect=10.0)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self):
+        self._get_client()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
     async def fetch_property_page_zyte(self, url: str) -> Optional[str]:
         """Fetch property page via Zyte API"""
         try:
@@ -590,40 +867,46 @@ class FlexibleWaterfrontExtractor:
                 "url": url, 
                 "httpResponseBody": True
             }
-            async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
-                response = await client.post(
-                    "https://api.zyte.com/v1/extract",
-                    auth=(self.api_key, ""),
-                    json=payload
-                )
-                logger.info(f"Zyte response status: {response.status_code}")
-                if response.status_code == 200:
-                    data = response.json()
-                    body_b64 = data.get('httpResponseBody')
-                    if body_b64:
-                        html_content = base64.b64decode(body_b64).decode("utf-8")
-                        logger.info(f"✅ Successfully fetched HTML via Zyte ({len(html_content)} characters)")
-                        return html_content
-                    else:
-                        logger.warning("No httpResponseBody in Zyte response")
-                        return None
+            response = await self._get_client().post(
+                "https://api.zyte.com/v1/extract",
+                json=payload
+            )
+            logger.info(f"Zyte response status: {response.status_code}")
+            if response.status_code == 200:
+                data = response.json()
+                body_b64 = data.get('httpResponseBody')
+                if body_b64:
+                    html_content = base64.b64decode(body_b64).decode("utf-8")
+                    logger.info(f"✅ Successfully fetched HTML via Zyte ({len(html_content)} characters)")
+                    return html_content
                 else:
-                    logger.error(f"Zyte API error: {response.status_code}")
-                    logger.error(f"Response: {response.text}")
+                    logger.warning("No httpResponseBody in Zyte response")
                     return None
+            else:
+                logger.error(f"Zyte API error: {response.status_code}")
+                logger.error(f"Response: {response.text}")
+                return None
         except Exception as e:
             logger.error(f"Error fetching property page via Zyte: {e}")
             return None
     
+    def _find_next_data(self, html_content: str) -> Optional[str]:
+        """Return the __NEXT_DATA__ script text, reusing the last search of the same page"""
+        cached = self._next_data_match
+        if cached is not None and cached[0] is html_content:
+            return cached[1]
+        match = _NEXT_DATA_RE.search(html_content)
+        script_text = match.group(1) if match else None
+        self._next_data_match = (html_content, script_text)
+        return script_text
+    
     def extract_next_data_payload(self, html_content: str) -> Optional[Dict[str, Any]]:
         """Extract __NEXT_DATA__ payload from HTML"""
         try:
             # Find the __NEXT_DATA__ script tag
-            pattern = r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>'
-            match = re.search(pattern, html_content, re.DOTALL)
-            if match:
-                payload_text = match.group(1)
-                payload = json.loads(payload_text)
+            payload_text = self._find_next_data(html_content)
+            if payload_text is not None:
+                payload = loads_json(payload_text)
                 logger.info(f"✅ Extracted __NEXT_DATA__ payload ({len(payload_text)} characters)")
                 return payload
             else:
@@ -636,10 +919,8 @@ class FlexibleWaterfrontExtractor:
     def extract_raw_next_data(self, html_content: str) -> Optional[str]:
         """Extract raw __NEXT_DATA__ script content as string (with backslashes, quotes, etc.)"""
         try:
-            pattern = r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>'
-            match = re.search(pattern, html_content, re.DOTALL)
-            if match:
-                raw_text = match.group(1)
+            raw_text = self._find_next_data(html_content)
+            if raw_text is not None:
                 logger.info(f"✅ Extracted raw __NEXT_DATA__ content ({len(raw_text)} characters)")
                 return raw_text
             else:
@@ -652,10 +933,8 @@ class FlexibleWaterfrontExtractor:
     def extract_processed_next_data(self, html_content: str) -> Optional[str]:
         """Extract processed __NEXT_DATA__ content with cleaned backslashes and quotes"""
         try:
-            pattern = r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>'
-            match = re.search(pattern, html_content, re.DOTALL)
-            if match:
-                raw_text = match.group(1)
+            raw_text = self._find_next_data(html_content)
+            if raw_text is not None:
                 # Clean up common JSON escaping issues
                 processed_text = raw_text.replace('\\"', '"').replace('\\\\', '\\')
                 logger.info(f"✅ Extracted processed __NEXT_DATA__ content ({len(processed_text)} characters)")
@@ -677,7 +956,7 @@ class FlexibleWaterfrontExtractor:
             
             if gdp_cache:
                 # Parse the stringified JSON
-                cache_data = json.loads(gdp_cache)
+                cache_data = loads_json(gdp_cache)
                 logger.info(f"✅ Extracted gdpClientCache with {len(cache_data)} keys")
                 return cache_data
             else:
@@ -687,10 +966,10 @@ class FlexibleWaterfrontExtractor:
             logger.error(f"Error extracting gdpClientCache: {e}")
             return None
     
-    def get_nested_value(self, obj: Any, path: str) -> Any:
-        """Get nested value from object using dot notation path"""
+    def get_nested_value(self, obj: Any, path: Union[str, Tuple[str, ...]]) -> Any:
+        """Get nested value from object using dot notation path (or a pre-split key tuple)"""
         try:
-            keys = path.split('.')
+            keys = split_path(path) if isinstance(path, str) else path
             current = obj
             for key in keys:
                 if isinstance(current, dict) and key in current:
@@ -710,7 +989,7 @@ class FlexibleWaterfrontExtractor:
                 current_path = f"{path}.{key}" if path else key
                 if isinstance(value, str):
                     # Check if the string contains waterfront keywords
-                    if any(keyword in value.lower() for keyword in ['waterfront', 'ocean', 'intracoastal', 'canal', 'dock', 'boat', 'marina', 'slip', 'bridge', 'depth']):
+                    if has_waterfront_info(value.lower()):
                         keywords.append(f"{current_path}: {value}")
                 elif isinstance(value, (dict, list)):
                     keywords.extend(self.search_for_waterfront_info(value, current_path))
@@ -941,25 +1220,32 @@ class FlexibleWaterfrontExtractor:
         Returns:
             First non-empty value found or None
         """
+        # Lowercase the variations once for the whole walk, not per key visited
+        variations_lower = [variation.lower() for variation in field_variations]
+        return self._search_recursive_json_lower(data, variations_lower, max_depth, current_depth)
+    
+    def _search_recursive_json_lower(self, data: Any, variations_lower: List[str], max_depth: int, current_depth: int) -> Any:
+        """search_recursive_json with the field variations already lowercased"""
         if current_depth >= max_depth:
             return None
         
         if isinstance(data, dict):
             for key, value in data.items():
                 # Check if key matches any field variation
-                if any(variation.lower() in key.lower() or key.lower() in variation.lower() for variation in field_variations):
+                key_lower = key.lower()
+                if any(variation in key_lower or key_lower in variation for variation in variations_lower):
                     if value is not None and value != "" and value != []:
                         return value
                 
                 # Recursively search nested structures
                 if isinstance(value, (dict, list)):
-                    result = self.search_recursive_json(value, field_variations, max_depth, current_depth + 1)
+                    result = self._search_recursive_json_lower(value, variations_lower, max_depth, current_depth + 1)
                     if result is not None:
                         return result
         
         elif isinstance(data, list):
             for item in data:
-                result = self.search_recursive_json(item, field_variations, max_depth, current_depth + 1)
+                result = self._search_recursive_json_lower(item, variations_lower, max_depth, current_depth + 1)
                 if result is not None:
                     return result
         
@@ -1160,8 +1446,7 @@ class FlexibleWaterfrontExtractor:
                 
                 # Determine waterfront features
                 boat_access = bool(property_data.get('waterfront_keywords') and 
-                                 any(t in ' '.join(property_data['waterfront_keywords']).lower() 
-                                     for t in ['dock', 'boat', 'marina']))
+                                 has_boat_access(' '.join(property_data['waterfront_keywords']).lower()))
                 
                 # Clean up data types for database storage using safe conversion
                 waterfront_features_clean = self._safe_convert_for_db(waterfront_features)
@@ -1200,23 +1485,6 @@ class FlexibleWaterfrontExtractor:
                     'extracted_community_features': property_data.get('extracted_community_features')
                 }
                 
-                # Store additional comprehensive fields
-                for field_name, field_value in additional_fields_to_store.items():
-                    if field_value is not None:
-                        content_preview = str(field_value)[:200] if field_value else None
-                        conn.execute(text('''
-                            INSERT INTO listing_text_content (zpid, content_type, content_full, content_preview)
-                            VALUES (:zpid, :content_type, :content_full, :content_preview)
-                            ON CONFLICT (zpid, content_type) DO UPDATE SET
-                                content_full = EXCLUDED.content_full,
-                                content_preview = EXCLUDED.content_preview
-                        '''), {
-                            'zpid': zpid,
-                            'content_type': field_name,
-                            'content_full': json.dumps(field_value) if isinstance(field_value, (dict, list)) else str(field_value),
-                            'content_preview': content_preview
-                        })
-                
                 # Store enhanced waterfront information
                 enhanced_waterfront_fields = {
                     'waterfront_type': property_data.get('waterfront_type'),
@@ -1227,21 +1495,21 @@ class FlexibleWaterfrontExtractor:
                     'enhanced_water_depth': property_data.get('regex_water_depth')
                 }
                 
-                for field_name, field_value in enhanced_waterfront_fields.items():
-                    if field_value is not None:
-                        content_preview = str(field_value)[:200] if field_value else None
-                        conn.execute(text('''
-                            INSERT INTO listing_text_content (zpid, content_type, content_full, content_preview)
-                            VALUES (:zpid, :content_type, :content_full, :content_preview)
-                            ON CONFLICT (zpid, content_type) DO UPDATE SET
-                                content_full = EXCLUDED.content_full,
-                                content_preview = EXCLUDED.content_preview
-                        '''), {
-                            'zpid': zpid,
-                            'content_type': field_name,
-                            'content_full': json.dumps(field_value) if isinstance(field_value, (dict, list)) else str(field_value),
-                            'content_preview': content_preview
-                        })
+                # Additional comprehensive fields and enhanced waterfront information,
+                # sent as one executemany instead of a round trip per field
+                text_rows = [
+                    {
+                        'zpid': zpid,
+                        'content_type': field_name,
+                        'content_full': json.dumps(field_value) if isinstance(field_value, (dict, list)) else str(field_value),
+                        'content_preview': str(field_value)[:200] if field_value else None
+                    }
+                    for fields in (additional_fields_to_store, enhanced_waterfront_fields)
+                    for field_name, field_value in fields.items()
+                    if field_value is not None
+                ]
+                if text_rows:
+                    conn.execute(TEXT_CONTENT_UPSERT_SQL, text_rows)
                 
                 # Upsert details with description_raw
                 conn.execute(text('''
@@ -1303,16 +1571,14 @@ class FlexibleWaterfrontExtractor:
                     
                     # Limit photos to prevent hanging
                     max_photos = min(len(photos), 10)
+                    photo_rows = []
                     for i, photo in enumerate(photos[:max_photos]):
                         mixed_sources = photo.get('mixedSources', {})
                         jpeg_urls = mixed_sources.get('jpeg', [])
                         webp_urls = mixed_sources.get('webp', [])
                         main_url = jpeg_urls[0].get('url', '') if jpeg_urls else ''
                         
-                        conn.execute(text('''
-                            INSERT INTO property_photos (zpid, caption, main_url, jpeg_resolutions, webp_resolutions, photo_order)
-                            VALUES (:zpid, :caption, :main_url, :jpeg_resolutions, :webp_resolutions, :photo_order)
-                        '''), {
+                        photo_rows.append({
                             'zpid': zpid,
                             'caption': photo.get('caption', ''),
                             'main_url': main_url,
@@ -1320,22 +1586,13 @@ class FlexibleWaterfrontExtractor:
                             'webp_resolutions': json.dumps(webp_urls),
                             'photo_order': i
                         })
-                        
-                        # Check timeout during photo processing
-                        if time.time() - start_time > self.timeout_seconds:
-                            logger.warning(f"⚠️ Photo processing taking too long for {zpid}, stopping...")
-                            break
+                    conn.execute(PHOTO_INSERT_SQL, photo_rows)
                 
                 # Store text content (limit size to prevent hanging)
+                text_rows = []
                 if property_data.get('description'):
                     desc_content = property_data['description'][:10000]  # Limit description size
-                    conn.execute(text('''
-                        INSERT INTO listing_text_content (zpid, content_type, content_full, content_preview)
-                        VALUES (:zpid, :content_type, :content_full, :content_preview)
-                        ON CONFLICT (zpid, content_type) DO UPDATE SET
-                            content_full = EXCLUDED.content_full,
-                            content_preview = EXCLUDED.content_preview
-                    '''), {
+                    text_rows.append({
                         'zpid': zpid,
                         'content_type': 'description',
                         'content_full': desc_content,
@@ -1343,13 +1600,7 @@ class FlexibleWaterfrontExtractor:
                     })
                 
                 if property_data.get('waterfront_keywords'):
-                    conn.execute(text('''
-                        INSERT INTO listing_text_content (zpid, content_type, content_full, content_preview)
-                        VALUES (:zpid, :content_type, :content_full, :content_preview)
-                        ON CONFLICT (zpid, content_type) DO UPDATE SET
-                            content_full = EXCLUDED.content_full,
-                            content_preview = EXCLUDED.content_preview
-                    '''), {
+                    text_rows.append({
                         'zpid': zpid,
                         'content_type': 'waterfront_keywords',
                         'content_full': json.dumps(property_data['waterfront_keywords']),
@@ -1361,46 +1612,24 @@ class FlexibleWaterfrontExtractor:
                 if extracted_fields:
                     # Limit the size of extracted fields to prevent hanging
                     limited_fields = dict(list(extracted_fields.items())[:20])  # Max 20 fields
-                    conn.execute(text('''
-                        INSERT INTO listing_text_content (zpid, content_type, content_full, content_preview)
-                        VALUES (:zpid, :content_type, :content_full, :content_preview)
-                        ON CONFLICT (zpid, content_type) DO UPDATE SET
-                            content_full = EXCLUDED.content_full,
-                            content_preview = EXCLUDED.content_preview
-                    '''), {
+                    text_rows.append({
                         'zpid': zpid,
                         'content_type': 'reso_facts',
                         'content_full': json.dumps(limited_fields),
                         'content_preview': ', '.join([f"{k}: {v}" for k, v in list(limited_fields.items())[:5]])
                     })
                 
-                # Store additional comprehensive fields
-                for field_name, field_value in additional_fields_to_store.items():
-                    if field_value is not None:
-                        content_preview = str(field_value)[:200] if field_value else None
-                        conn.execute(text('''
-                            INSERT INTO listing_text_content (zpid, content_type, content_full, content_preview)
-                            VALUES (:zpid, :content_type, :content_full, :content_preview)
-                            ON CONFLICT (zpid, content_type) DO UPDATE SET
-                                content_full = EXCLUDED.content_full,
-                                content_preview = EXCLUDED.content_preview
-                        '''), {
-                            'zpid': zpid,
-                            'content_type': field_name,
-                            'content_full': json.dumps(field_value) if isinstance(field_value, (dict, list)) else str(field_value),
-                            'content_preview': content_preview
-                        })
+                if text_rows:
+                    conn.execute(TEXT_CONTENT_UPSERT_SQL, text_rows)
             
             db_time = time.time() - start_time
             logger.info(f"✅ Successfully stored property {zpid} to database in {db_time:.2f}s")
             
-            # Mark successful database storage in field tracker
-            if hasattr(self, 'field_tracker') and self.field_tracker:
-                # Find the property in the tracker and mark it as stored
-                for prop_data in self.field_tracker.get('properties_processed', []):
-                    if prop_data.get('zpid') == zpid:
-                        prop_data['_database_stored'] = True
-                        break
+            # Count a property that was tracked before it was stored
+            with self._tracker_lock:
+                if zpid in self.field_tracker['unstored_zpids']:
+                    self.field_tracker['unstored_zpids'].discard(zpid)
+                    self.field_tracker['db_success_count'] += 1
             
             # Determine what action was taken
             if not existing_data:
@@ -2107,8 +2336,7 @@ class FlexibleWaterfrontExtractor:
             property_data.get('water_view') or 
             property_data.get('water_body_name') or
             property_data.get('waterfront_keywords') or
-            any(keyword in str(property_data.get('description', '')).lower() 
-                for keyword in ['waterfront', 'ocean', 'canal', 'river', 'lake', 'bay', 'dock'])
+            has_waterfront_description(str(property_data.get('description', '')).lower())
         )
         
         # Waterfront type classification
@@ -2140,6 +2368,26 @@ class FlexibleWaterfrontExtractor:
         
         return property_data
     
+    def _write_html(self, html_file: Path, html_content: str) -> Path:
+        """Write HTML to disk, zstd-compressed as .html.zst when available"""
+        if self._html_compressor is None:
+            html_file.write_text(html_content, encoding='utf-8')
+            return html_file
+        html_file = html_file.with_name(html_file.name + '.zst')
+        html_file.write_bytes(self._html_compressor.compress(html_content.encode('utf-8')))
+        return html_file
+    
+    @staticmethod
+    def read_saved_html(html_file: Union[str, Path]) -> str:
+        """Read a saved HTML file, plain or .html.zst"""
+        html_file = Path(html_file)
+        if html_file.suffix != '.zst':
+            return html_file.read_text(encoding='utf-8')
+        if zstd is None:
+            raise RuntimeError(f"zstandard is required to read {html_file}")
+        # compress() records the content size, so one-shot decompress works
+        return zstd.ZstdDecompressor().decompress(html_file.read_bytes()).decode('utf-8')
+    
     def save_json_snippets(self, url: str, html_content: str, payload: Dict[str, Any], cache_data: Dict[str, Any], 
                            property_data: Dict[str, Any]) -> None:
         """Save JSON snippets for comparison across sessions"""
@@ -2149,14 +2397,10 @@ class FlexibleWaterfrontExtractor:
 
             # Save HTML and a static (no-scripts) copy (only if enabled)
             if self.save_html:
-                html_file = self.html_dir / f"{zpid}_{ts}.html"
-                with open(html_file, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
+                self._write_html(self.html_dir / f"{zpid}_{ts}.html", html_content)
                 try:
                     no_scripts = re.sub(r'<script\b[^<]*(?:(?!<\/script>).)*<\/script>', '', html_content, flags=re.IGNORECASE|re.DOTALL)
-                    static_file = self.html_dir / f"{zpid}_{ts}_static.html"
-                    with open(static_file, 'w', encoding='utf-8') as sf:
-                        sf.write(no_scripts)
+                    self._write_html(self.html_dir / f"{zpid}_{ts}_static.html", no_scripts)
                 except Exception:
                     pass
             
@@ -2232,7 +2476,7 @@ class FlexibleWaterfrontExtractor:
                 
                 # Save URLs list if requested
                 if property_urls and self.save_urls_list:
-                    self._save_urls_list(property_urls, url)
+                    await self._save_urls_list(property_urls, url)
             
             if property_urls:
                 logger.info(f"🔍 Found {len(property_urls)} property URLs across search results pages")
@@ -2244,17 +2488,22 @@ class FlexibleWaterfrontExtractor:
                 logger.info(f"🔍 Starting pre-filtering of {len(urls_to_process)} URLs")
                 
                 # Pre-filter URLs to remove already scraped properties
-                filtered_urls = []
+                url_zpids = []
                 for prop_url in urls_to_process:
                     logger.info(f"🔍 Checking URL: {prop_url}")
                     zpid_match = re.search(r'/([^/]+)_zpid/$', prop_url)
-                    if zpid_match:
-                        zpid = zpid_match.group(1)
+                    url_zpids.append(zpid_match.group(1) if zpid_match else None)
+                
+                # Check the database BEFORE we start processing, for all ZPIDs at once
+                already_stored = await self._find_existing_zpids_db(
+                    list({zpid for zpid in url_zpids if zpid})
+                )
+                
+                filtered_urls = []
+                for prop_url, zpid in zip(urls_to_process, url_zpids):
+                    if zpid:
                         logger.info(f"🔍 Extracted ZPID: {zpid}")
-                        
-                        # Check database BEFORE we start processing
-                        logger.info(f"🔍 About to check database for ZPID: {zpid}")
-                        if await self._is_property_already_scraped_db(zpid):
+                        if zpid in already_stored:
                             logger.info(f"⏭️ Skipping {zpid} - already in database, no need to scrape")
                             continue
                         
@@ -2769,16 +3018,17 @@ class FlexibleWaterfrontExtractor:
         if query.get('originalReqUrlPath'):
             property_data['original_url_path'] = query.get('originalReqUrlPath')
         # Coordinates fallbacks
-        for k in ['latitude','longitude','lat','lon','lng']:
-            if k in qcoords and qcoords[k] is not None:
-                property_data[f'coord_{k}'] = qcoords[k]
+        for k, field in COORD_FIELDS:
+            if qcoords.get(k) is not None:
+                property_data[field] = qcoords[k]
 
         # Save JSON snippets for comparison
         self.save_json_snippets(url, html_content, payload, cache_data, property_data)
         
         # Store to database if enabled
         if self.enable_db_storage:
-            db_result = self.store_property_to_database(property_data)
+            # Synchronous SQLAlchemy; keep it off the event loop
+            db_result = await asyncio.to_thread(self.store_property_to_database, property_data)
             if db_result['success']:
                 # Log the specific action taken
                 if db_result['action'] == 'insert':
@@ -2803,59 +3053,62 @@ class FlexibleWaterfrontExtractor:
         
         return property_data
     
-    async def extract_multiple_properties(self, urls: List[str]) -> List[Dict[str, Any]]:
-        """Extract multiple properties with timeout handling and progress indicators"""
+    async def extract_multiple_properties(self, urls: List[str],
+                                          progress_callback: Optional[Callable[[int, int, int], Awaitable[None]]] = None) -> List[Dict[str, Any]]:
+        """Extract multiple properties with timeout handling and progress indicators
+        
+        progress_callback, if given, is awaited after each URL with (done, total, failed).
+        """
         logger.info(f"🚀 Starting extraction of {len(urls)} properties")
         start_time = time.time()
         
-        results = []
+        results_by_index: List[Optional[Dict[str, Any]]] = [None] * len(urls)
         failed_urls = []
+        done = 0
+        
+        # Up to max_concurrent_properties extractions in flight; Zyte latency dominates
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_properties))
         
         # Use tqdm for progress bar
-        with tqdm(total=len(urls), desc="Extracting properties", unit="prop") as pbar:
-            for i, url in enumerate(urls, 1):
-                logger.info(f"📊 Processing property {i}/{len(urls)}")
-                pbar.set_description(f"Processing {i}/{len(urls)}")
-                
-                try:
-                    # Set timeout for each property extraction with recovery
-                    extraction_task = asyncio.create_task(self.extract_property(url))
+        with tqdm(total=len(urls), desc="Extracting properties", unit="prop",
+                  mininterval=PROGRESS_MININTERVAL, disable=self.simple_logging) as pbar:
+            async def extract_one(i: int, url: str):
+                nonlocal done
+                async with semaphore:
+                    logger.info(f"📊 Processing property {i}/{len(urls)}")
+                    
                     try:
-                        result = await asyncio.wait_for(extraction_task, timeout=self.timeout_seconds)
+                        # Set timeout for each property extraction (cancelled on timeout)
+                        result = await asyncio.wait_for(self.extract_property(url), timeout=self.timeout_seconds)
                         if result:
-                            results.append(result)
+                            results_by_index[i - 1] = result
                             logger.info(f"✅ Successfully extracted property {i}")
-                            pbar.set_postfix({"success": len(results), "failed": len(failed_urls)})
                         else:
                             logger.warning(f"⚠️ Failed to extract property {i} - no result")
                             failed_urls.append(url)
-                            pbar.set_postfix({"success": len(results), "failed": len(failed_urls)})
                     except asyncio.TimeoutError:
-                        logger.error(f"⏰ Timeout extracting property {i} after {self.timeout_seconds * 2}s")
+                        logger.error(f"⏰ Timeout extracting property {i} after {self.timeout_seconds}s")
                         failed_urls.append(url)
-                        pbar.set_postfix({"success": len(results), "failed": len(failed_urls)})
-                        # Cancel the hanging task
-                        extraction_task.cancel()
-                        try:
-                            await extraction_task
-                        except asyncio.CancelledError:
-                            pass
-                        
-                except Exception as e:
-                    logger.error(f"❌ Error extracting property {i}: {e}")
-                    failed_urls.append(url)
-                    pbar.set_postfix({"success": len(results), "failed": len(failed_urls)})
-                        
-                except Exception as e:
-                    logger.error(f"❌ Error extracting property {i}: {e}")
-                    failed_urls.append(url)
-                    pbar.set_postfix({"success": len(results), "failed": len(failed_urls)})
-                
-                pbar.update(1)
-                
-                # Small delay between requests to be respectful
-                if i < len(urls):  # Don't delay after the last one
-                    await asyncio.sleep(1)
+                    except Exception as e:
+                        logger.error(f"❌ Error extracting property {i}: {e}")
+                        failed_urls.append(url)
+                    
+                    done += 1
+                    # Shown on the next throttled redraw instead of forcing one
+                    pbar.set_postfix({"success": done - len(failed_urls), "failed": len(failed_urls)}, refresh=False)
+                    pbar.update(1)
+                    self._emit_progress(done, len(urls), len(failed_urls))
+                    if progress_callback:
+                        await progress_callback(done, len(urls), len(failed_urls))
+                    
+                    # Small per-slot delay between requests to be respectful
+                    if done < len(urls):  # Don't delay after the last one
+                        await asyncio.sleep(1)
+            
+            await asyncio.gather(*(extract_one(i, url) for i, url in enumerate(urls, 1)))
+        
+        # Keep results in input order
+        results = [result for result in results_by_index if result]
         
         # Calculate timing
         total_time = time.time() - start_time
@@ -2870,7 +3123,7 @@ class FlexibleWaterfrontExtractor:
         
         # Save combined results and comprehensive summary under summary dir
         ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-        combined_file = self.summary_dir / f"combined_{ts}.json"
+        combined_file = self.summary_dir / f"combined_{ts}{self.run_suffix}.json"
         with open(combined_file, 'w', encoding='utf-8') as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
         logger.info(f"✅ Saved combined results to {combined_file}")
@@ -2894,14 +3147,14 @@ class FlexibleWaterfrontExtractor:
             'failed_urls': failed_urls[:10]  # Include first 10 failed URLs for debugging
         }
         
-        summary_file = self.summary_dir / f"run_summary_{ts}.json"
+        summary_file = self.summary_dir / f"run_summary_{ts}{self.run_suffix}.json"
         with open(summary_file, 'w', encoding='utf-8') as f:
             json.dump(summary, f, indent=2, ensure_ascii=False)
         logger.info(f"✅ Saved summary to {summary_file}")
         
         # Generate and save field completion report
         completion_report = self._generate_completion_report()
-        report_file = self.summary_dir / f"field_completion_report_{ts}.txt"
+        report_file = self.summary_dir / f"field_completion_report_{ts}{self.run_suffix}.txt"
         with open(report_file, 'w', encoding='utf-8') as f:
             f.write(completion_report)
         logger.info(f"✅ Saved field completion report to {report_file}")
@@ -3165,7 +3418,8 @@ class FlexibleWaterfrontExtractor:
         }
         
         # Process each cache file
-        for cache_file in tqdm(cache_files, desc="Processing cache files"):
+        for cache_file in tqdm(cache_files, desc="Processing cache files",
+                               mininterval=PROGRESS_MININTERVAL, disable=self.simple_logging):
             try:
                 file_result = self._process_single_cache_file(cache_file, update_existing)
                 if file_result:
@@ -3182,6 +3436,19 @@ class FlexibleWaterfrontExtractor:
         logger.info(f"🎉 Cache processing complete: {results['processed']} processed, {results['updated']} updated, {results['errors']} errors")
         return results
 
+    def _load_cache_file(self, cache_file: Path) -> Dict[str, Any]:
+        """Load a cache file; in low-memory mode keep only the property query entry"""
+        if not (self.low_memory and ijson):
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        
+        # Stream the top-level query entries and stop at the one holding the property
+        with open(cache_file, 'rb') as f:
+            for key, value in ijson.kvitems(f, '', use_float=True):
+                if isinstance(value, dict) and 'property' in value:
+                    return {key: value}
+        return {}
+    
     def _process_single_cache_file(self, cache_file: Path, update_existing: bool) -> Optional[Dict[str, Any]]:
         """
         Process a single cache file and extract property data
@@ -3199,8 +3466,7 @@ class FlexibleWaterfrontExtractor:
             logger.info(f"🔍 Processing cache file: {cache_file.name} (ZPID: {zpid})")
             
             # Read and parse cache file
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            cache_data = self._load_cache_file(cache_file)
             
             # Extract property data from cache
             property_data = self.extract_property_data_flexible_from_cache(cache_data)
@@ -3773,6 +4039,12 @@ async def main():
                        help='Save extracted URLs list to file for later continuation (default: False)')
     parser.add_argument('--continue', dest='continue_from_file', type=str,
                        help='Continue processing from a previously saved URLs file')
+    parser.add_argument('--stdin', action='store_true', default=False,
+                       help='Read URLs from stdin, one per line (default: False)')
+    parser.add_argument('--emit-progress', action='store_true', default=False,
+                       help='Print "PROGRESS <done>/<total> failed=<n>" lines to stdout (default: False)')
+    parser.add_argument('--low-memory', action='store_true', default=False,
+                       help='Stream cache files with ijson, keeping only the property entry (default: False)')
     
     args = parser.parse_args()
     
@@ -3791,24 +4063,31 @@ async def main():
         simple_logging=args.simple,
         max_concurrent_properties=args.max_concurrent_properties,
         save_urls_list=args.save_urls_list,
-        continue_from_file=args.continue_from_file
+        continue_from_file=args.continue_from_file,
+        emit_progress=args.emit_progress,
+        low_memory=args.low_memory
     )
     
-    if args.mode == 'urls':
-        await _process_urls_mode(extractor, args)
-    elif args.mode == 'cache':
-        await _process_cache_mode(extractor, args)
-    else:
-        logger.error(f"❌ Invalid mode: {args.mode}")
+    # The context manager closes the shared HTTP client when done
+    async with extractor:
+        if args.mode == 'urls':
+            await _process_urls_mode(extractor, args)
+        elif args.mode == 'cache':
+            await _process_cache_mode(extractor, args)
+        else:
+            logger.error(f"❌ Invalid mode: {args.mode}")
 
 async def _process_urls_mode(extractor: FlexibleWaterfrontExtractor, args):
     """Process URLs mode - scrape properties from URLs"""
-    if not args.urls_file and not args.continue_from_file:
-        logger.error("❌ Either --urls-file or --continue is required for urls mode")
+    if not args.urls_file and not args.continue_from_file and not args.stdin:
+        logger.error("❌ One of --urls-file, --continue or --stdin is required for urls mode")
         return
     
-    # Read URLs from file or continue from saved file
-    if args.continue_from_file:
+    # Read URLs from stdin, file or continue from saved file
+    if args.stdin:
+        urls = [line.strip() for line in sys.stdin if line.strip() and not line.startswith('#')]
+        logger.info(f"📖 Loaded {len(urls)} URLs from stdin")
+    elif args.continue_from_file:
         # Continue from saved URLs file
         urls = extractor._load_urls_from_file(args.continue_from_file)
         if not urls:
@@ -3878,7 +4157,7 @@ async def _process_cache_mode(extractor: FlexibleWaterfrontExtractor, args: argp
     updated_count = 0
     error_count = 0
     
-    with tqdm(total=len(cache_files), desc="Processing cache files") as pbar:
+    with tqdm(total=len(cache_files), desc="Processing cache files", mininterval=PROGRESS_MININTERVAL) as pbar:
         for cache_file in cache_files:
             try:
                 result = extractor._process_single_cache_file(
@@ -0,0 +1,15 @@
+-- Indexes for the predicates used by explore_database_corrected.py
+-- Idempotent: applied on every explorer and flag-fixer start-up, one statement
+-- at a time (db_pool.apply_migrations); CONCURRENTLY so builds don't block writes
+
+-- Sample properties: ORDER BY created_at DESC LIMIT n becomes an index scan
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_listings_summary_created_at
+    ON listings_summary (created_at DESC);
+
+-- Geographic roll-ups by state and city
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_listings_summary_state_city
+    ON listings_summary (state, city) WHERE state IS NOT NULL;
+
+-- Waterfront-only aggregates
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_listings_summary_waterfront
+    ON listings_summary (is_waterfront) WHERE is_waterfront;
@@ -0,0 +1,10 @@
+-- Trigram index for the description keyword scan in fix_waterfront_flags.py
+-- Idempotent: applied on every explorer and flag-fixer start-up, one statement
+-- at a time (db_pool.apply_migrations); CONCURRENTLY so builds don't block writes
+
+-- Lets description_raw ~* 'ocean|canal|...' (same matches as the old
+-- LOWER(description_raw) LIKE '%kw%' chain) use an index instead of a full scan
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_listings_detail_description_trgm
+    ON listings_detail USING GIN (description_raw gin_trgm_ops);